@@ -0,0 +1,54 @@
+"""Сравнение скорости вывода таблицы с PrettyTable.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.pretty_output
+"""
+import contextlib
+import io
+import time
+
+from prettytable import PrettyTable
+
+from src import constants, outputs
+
+ROWS = 10_000
+
+
+def get_results(rows=ROWS):
+    """Таблица версий документации заданного размера."""
+    return [('Ссылка', 'Версия', 'Статус')] + [
+        (f'https://docs.python.org/3.{number}/', f'3.{number}',
+         'stable' if number % 3 else 'security-fixes')
+        for number in range(rows)
+    ]
+
+
+def print_prettytable(results):
+    table = PrettyTable()
+    table.field_names = results[0]
+    table.align = constants.TABLE_ALIGN
+    table.add_rows(results[1:])
+    print(table)
+
+
+def measure(function, results):
+    """Время вывода таблицы функцией function, вывод отбрасывается."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        function(results)
+        return time.perf_counter() - started
+
+
+def main():
+    results = get_results()
+    prettytable_time = measure(print_prettytable, results)
+    stream_time = measure(outputs.pretty_output, results)
+    print(f'Строк: {ROWS}')
+    print(f'PrettyTable:   {prettytable_time:.3f} c')
+    print(f'pretty_output: {stream_time:.3f} c '
+          f'({prettytable_time / stream_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
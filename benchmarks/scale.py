@@ -0,0 +1,68 @@
+"""Рост времени разбора PEP и списка версий с размером данных.
+
+Для каждой операции выводится, во сколько раз выросло время при росте
+данных в 4 раза; при линейной сложности это около 4. Запуск из корня
+репозитория:
+
+    python -m benchmarks.scale
+"""
+import contextlib
+import io
+import time
+
+import requests
+import requests_mock
+
+from src import utils
+from tests.fixture_data.synthetic import SyntheticPeps, status_dl, versions_ul
+
+ROWS = 10_000
+GROWTH = 4
+
+
+def best_time(function, *args, repeat=3):
+    """Наименьшее время из repeat вызовов function."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def parse_rows(pep_data):
+    rows, base_url = pep_data
+    return [utils.parse_pep_row(row, base_url) for row in rows[1:]]
+
+
+def analyze(synthetic):
+    session = requests.Session()
+    session.trust_env = False
+    adapter = requests_mock.Adapter()
+    synthetic.register(adapter)
+    session.mount('https://', adapter)
+    with contextlib.redirect_stderr(io.StringIO()):
+        return utils.analyze_peps(session, synthetic.pep_rows())
+
+
+# Операция и построитель её аргумента по числу строк.
+CASES = (
+    ('parse_pep_row', parse_rows,
+     lambda rows: SyntheticPeps(rows).pep_rows(), ROWS),
+    ('analyze_peps', analyze, SyntheticPeps, ROWS // 10),
+    ('extract_status_from_dl', utils.extract_status_from_dl, status_dl,
+     ROWS // 2),
+    ('parse_versions_list', utils.parse_versions_list, versions_ul, ROWS),
+)
+
+
+def main():
+    for name, function, make_data, rows in CASES:
+        small = best_time(function, make_data(rows // GROWTH))
+        large = best_time(function, make_data(rows))
+        print(f'{name}: {rows // GROWTH} -> {rows} строк, '
+              f'время выросло в {large / small:.1f} раза')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import zipfile
+import zlib
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from pathlib import Path
+
+from src import constants
+from src.exceptions import ArchiveError
+from src.outputs import write_atomically
+from src.records import ArchiveEntry
+
+
+@contextmanager
+def open_archive(archive_path):
+    """Открывает zip-архив для чтения.
+
+    С диска читаются только нужные участки файла: оглавление архива и
+    данные запрошенных файлов, а не весь архив целиком.
+    """
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            yield archive
+    except (zipfile.BadZipFile, zlib.error) as error:
+        raise ArchiveError(f'Повреждён архив {archive_path}: {error}')
+
+
+def get_manifest_path(archive_path):
+    """Путь к манифесту архива."""
+    return archive_path.with_name(
+        archive_path.name + constants.MANIFEST_SUFFIX)
+
+
+def archive_signature(archive_path, chunk_size=constants.DOWNLOAD_CHUNK_SIZE):
+    """SHA-256 содержимого архива для проверки актуальности манифеста.
+
+    Подпись не зависит от времени изменения файла: download перезаписывает
+    архив при каждом запуске, но манифест остаётся действительным, пока
+    содержимое архива не изменилось.
+    """
+    digest = hashlib.sha256()
+    with open(archive_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_entries(archive):
+    """Список файлов архива по его оглавлению, без распаковки."""
+    return [
+        ArchiveEntry(info.filename, info.file_size, info.compress_size,
+                     info.CRC)
+        for info in archive.infolist() if not info.is_dir()
+    ]
+
+
+def build_manifest(archive_path, verify=False, signature=None):
+    """Читает оглавление архива и сохраняет манифест рядом с архивом.
+
+    С verify все файлы архива распаковываются в память по очереди и
+    сверяются с контрольными суммами, на диск ничего не пишется.
+    """
+    with open_archive(archive_path) as archive:
+        if verify:
+            bad_name = archive.testzip()
+            if bad_name is not None:
+                raise ArchiveError(
+                    f'Неверная контрольная сумма файла {bad_name} в архиве '
+                    f'{archive_path}'
+                )
+        entries = read_entries(archive)
+    manifest = {
+        'archive': archive_path.name,
+        'signature': signature or archive_signature(archive_path),
+        'verified': verify,
+        'entries': entries,
+    }
+    write_atomically(
+        get_manifest_path(archive_path),
+        lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2)
+    )
+    return entries
+
+
+def read_manifest(manifest_path, signature, verify=False):
+    """Возвращает список файлов из манифеста, если он подходит к архиву.
+
+    Отсутствующий, устаревший или повреждённый манифест считается промахом.
+    """
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if (manifest['signature'] != signature
+                or verify and not manifest['verified']):
+            return None
+        return [ArchiveEntry(*entry) for entry in manifest['entries']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load_manifest(archive_path, verify=False):
+    """Возвращает список файлов архива из манифеста.
+
+    Манифест строится заново, если его нет или он повреждён, если архив
+    изменился или требуется проверка, которая для этого архива ещё не
+    выполнялась.
+    """
+    manifest_path = get_manifest_path(archive_path)
+    signature = archive_signature(archive_path)
+    entries = read_manifest(manifest_path, signature, verify)
+    if entries is not None:
+        return entries
+    entries = build_manifest(archive_path, verify, signature)
+    logging.info(
+        f'Манифест архива сохранён: {manifest_path} '
+        f'({len(entries)} файлов)'
+    )
+    return entries
+
+
+def file_crc(path, chunk_size=constants.DOWNLOAD_CHUNK_SIZE):
+    """Считает CRC32 файла по частям."""
+    crc = constants.ZERO_INT
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def is_extracted(target_path, entry):
+    """Проверяет, что файл уже распакован и совпадает с файлом архива."""
+    return (
+        target_path.exists()
+        and target_path.stat().st_size == entry.size
+        and file_crc(target_path) == entry.crc
+    )
+
+
+def extract_members(archive_path, patterns, target_dir, entries=None):
+    """Распаковывает только файлы архива, подходящие под шаблоны.
+
+    Уже распакованные файлы с той же контрольной суммой пропускаются.
+    Возвращает пути к файлам, подходящим под шаблоны.
+    """
+    entries = entries or load_manifest(archive_path)
+    selected = [
+        entry for entry in entries
+        if any(fnmatch(entry.name, pattern) for pattern in patterns)
+    ]
+    if not selected:
+        logging.warning(
+            f'В архиве {archive_path} нет файлов по шаблонам {patterns}')
+        return []
+    paths = []
+    with open_archive(archive_path) as archive:
+        for entry in selected:
+            target_path = target_dir / entry.name
+            if not is_extracted(target_path, entry):
+                target_path = Path(archive.extract(entry.name, target_dir))
+                logging.info(f'Распакован файл: {target_path}')
+            paths.append(target_path)
+    return paths
@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+import sys
+
+from src import constants
+from src.records import PepStatus
+
+
+class PepCheckpoint:
+    """Состояние обработки PEP, периодически сохраняемое на диск."""
+
+    def __init__(self, path=None, save_every=constants.CHECKPOINT_EVERY):
+        self.path = path or constants.PEP_CHECKPOINT_PATH
+        self.save_every = save_every
+        self.statuses = {}
+        self.unsaved = constants.ZERO_INT
+
+    @classmethod
+    def load(cls, path=None, save_every=constants.CHECKPOINT_EVERY):
+        """Загружает состояние прошлого запуска, если оно сохранено.
+
+        Повреждённый файл состояния не прерывает запуск: обработка
+        начинается заново.
+        """
+        checkpoint = cls(path, save_every)
+        if not checkpoint.path.exists():
+            return checkpoint
+        try:
+            with open(checkpoint.path, encoding='utf-8') as f:
+                statuses = {
+                    number: PepStatus(
+                        number=number,
+                        url=url,
+                        real_status=sys.intern(real_status),
+                        expected_variants=tuple(expected_variants)
+                    )
+                    for number, url, real_status, expected_variants
+                    in json.load(f)
+                }
+        except (OSError, ValueError, TypeError) as error:
+            logging.warning(
+                f'Файл состояния {checkpoint.path} повреждён, обработка '
+                f'PEP начнётся заново: {error}'
+            )
+            return checkpoint
+        checkpoint.statuses = statuses
+        logging.info(
+            f'Возобновление обработки PEP: {len(checkpoint.statuses)} '
+            f'строк уже обработано ({checkpoint.path})'
+        )
+        return checkpoint
+
+    def __contains__(self, number):
+        return number in self.statuses
+
+    def get(self, number):
+        """Возвращает сохранённый статус PEP по номеру."""
+        return self.statuses.get(number)
+
+    def add(self, pep_status):
+        """Запоминает обработанный PEP и периодически сохраняет состояние."""
+        self.statuses[pep_status.number] = pep_status
+        self.unsaved += constants.ONE_INT
+        if self.unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        """Атомарно записывает состояние в файл."""
+        if not self.unsaved:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self.statuses.values()), f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.unsaved = constants.ZERO_INT
+
+    def remove(self):
+        """Удаляет файл состояния после успешного завершения обработки."""
+        if self.path.exists():
+            self.path.unlink()
@@ -1,13 +1,280 @@
 import argparse
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from collections import namedtuple
+from logging.handlers import (MemoryHandler, QueueHandler, QueueListener,
+                              RotatingFileHandler)
+from pathlib import Path
+
+from tqdm import tqdm
 
 from src import constants
+from src.exceptions import ConfigError
+
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
+
+Settings = namedtuple('Settings', (
+    'timeout',
+    'total_retries',
+    'backoff_factor',
+    'status_forcelist',
+    'max_workers',
+    'cache_backend',
+    'rate_limit',
+    'parser_engine',
+))
+
+DEFAULT_SETTINGS = Settings(
+    timeout=float(constants.TIME_OUT_GET_RESPOSE),
+    total_retries=constants.TOTAL_RETRIES,
+    backoff_factor=constants.BACKOFF_FACTOR,
+    status_forcelist=tuple(constants.STATUS_FORCE_LIST),
+    max_workers=constants.MAX_WORKERS,
+    cache_backend=constants.CACHE_BACKEND,
+    rate_limit=float(constants.RATE_LIMIT),
+    parser_engine=constants.PARSER_ENGINE,
+)
+
+SETTING_CHOICES = {'parser_engine': constants.PARSER_ENGINES}
+
+
+def positive_int(value):
+    """Тип аргумента командной строки: целое число не меньше единицы."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'ожидается целое число: {value}')
+    if number < constants.ONE_INT:
+        raise argparse.ArgumentTypeError(
+            f'ожидается число не меньше 1: {value}')
+    return number
+
+
+class ModeHelpAction(argparse.Action):
+    """Справка по режиму, если он указан, иначе общая справка."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS,
+                 default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings, dest=dest, default=default,
+                         nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        mode = getattr(namespace, 'mode', None)
+        parser.mode_parsers.get(mode, parser).print_help()
+        parser.exit()
+
+
+class ModeArgumentParser(argparse.ArgumentParser):
+    """Парсер аргументов, у каждого режима которого свои параметры.
+
+    Общие параметры разбирает сам парсер, а остальные аргументы после
+    имени режима — парсер этого режима. Параметры другого режима
+    приводят к ошибке, как и в подкомандах argparse, но имя режима
+    остаётся обычным позиционным аргументом mode.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, add_help=False, allow_abbrev=False, **kwargs)
+        self.mode_parsers = {}
+        self.add_argument(
+            '-h', '--help', action=ModeHelpAction,
+            help='Показать справку (после имени режима — справку режима)'
+        )
+
+    def add_mode_parser(self, mode):
+        """Создаёт парсер параметров режима mode."""
+        mode_parser = argparse.ArgumentParser(
+            prog=f'{self.prog} {mode}',
+            add_help=False,
+            allow_abbrev=False,
+            description=f'Параметры режима {mode}. Общие параметры '
+                        f'описаны в {self.prog} --help.'
+        )
+        self.mode_parsers[mode] = mode_parser
+        return mode_parser
+
+    def parse_known_args(self, args=None, namespace=None):
+        namespace, extras = super().parse_known_args(args, namespace)
+        mode_parser = self.mode_parsers.get(getattr(namespace, 'mode', None))
+        if mode_parser is not None:
+            namespace, extras = mode_parser.parse_known_args(
+                extras, namespace)
+        return namespace, extras
+
+
+def get_mode_options(parser, args):
+    """Значения параметров выбранного режима в виде словаря."""
+    mode_parser = parser.mode_parsers.get(args.mode)
+    if mode_parser is None:
+        return {}
+    return {
+        action.dest: getattr(args, action.dest)
+        for action in mode_parser._actions
+    }
+
+
+def add_resume_argument(parser, help):
+    parser.add_argument('--resume', action='store_true', help=help)
+
+
+def add_queue_argument(parser):
+    parser.add_argument(
+        '--queue',
+        type=Path,
+        help='Файл очереди шардов, общий для pep-shards и pep-worker'
+    )
+
+
+def add_pep_arguments(parser):
+    add_resume_argument(
+        parser, 'Продолжить прерванный запуск с точки сохранения')
+
+
+def add_latest_versions_arguments(parser):
+    parser.add_argument(
+        '--check-downloads',
+        action='store_true',
+        help='Сверить статусы версий со страницей загрузок python.org'
+    )
+
+
+def add_download_arguments(parser):
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Проверить архив по контрольным суммам'
+    )
+    parser.add_argument(
+        '--extract',
+        nargs='+',
+        metavar='PATTERN',
+        help='Распаковать из архива только файлы по шаблонам'
+    )
+
+
+def add_search_arguments(parser):
+    parser.add_argument(
+        '-q',
+        '--query',
+        required=True,
+        help='Поисковый запрос'
+    )
+
+
+def add_serve_arguments(parser):
+    parser.add_argument(
+        '--host',
+        default=constants.SERVE_HOST,
+        help='Адрес HTTP API'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=constants.SERVE_PORT,
+        help='Порт HTTP API'
+    )
+
+
+def add_pep_shards_arguments(parser):
+    add_queue_argument(parser)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=constants.SHARD_WORKERS,
+        help='Число процессов-обработчиков'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=constants.SHARD_SIZE,
+        help='Число PEP в одном шарде'
+    )
+    add_resume_argument(
+        parser, 'Не пересоздавать очередь, обработать оставшиеся шарды')
+
+
+def add_pep_history_arguments(parser):
+    parser.add_argument(
+        '--at',
+        metavar='YYYY-MM-DD',
+        help='Дата, на которую показать статусы PEP'
+    )
+    parser.add_argument(
+        '--pep',
+        dest='pep_number',
+        metavar='NUMBER',
+        help='Номер PEP, историю статусов которого показать'
+    )
+
+
+def add_warm_cache_arguments(parser):
+    parser.add_argument(
+        '--warm-modes',
+        nargs='+',
+        choices=constants.WARMUP_MODES,
+        default=constants.WARMUP_MODES,
+        help='Режимы, страницы которых нужно загрузить в кэш'
+    )
+    parser.add_argument(
+        '--import-cache',
+        type=Path,
+        metavar='PATH',
+        help='Импортировать кэш из файла перед прогревом'
+    )
+    parser.add_argument(
+        '--export-cache',
+        type=Path,
+        metavar='PATH',
+        help='Выгрузить кэш в файл после прогрева'
+    )
+
+
+def add_crawl_arguments(parser):
+    parser.add_argument(
+        '--start-url',
+        default=constants.MAIN_DOC_URL,
+        help='Адрес, с которого начинается обход'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        default=constants.CRAWL_MAX_PAGES,
+        help='Наибольшее число проверяемых адресов'
+    )
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        help='Наибольшая глубина обхода'
+    )
+
+
+# Параметры командной строки, относящиеся к отдельным режимам.
+MODE_ARGUMENTS = {
+    'pep': add_pep_arguments,
+    'latest-versions': add_latest_versions_arguments,
+    'download': add_download_arguments,
+    'whats-new-search': add_search_arguments,
+    'serve': add_serve_arguments,
+    'pep-shards': add_pep_shards_arguments,
+    'pep-worker': add_queue_argument,
+    'pep-history': add_pep_history_arguments,
+    'warm-cache': add_warm_cache_arguments,
+    'crawl': add_crawl_arguments,
+}
 
 
 def configure_argument_parser(available_modes):
-    """Создаёт и настраивает парсер аргументов командной строки."""
-    parser = argparse.ArgumentParser(description='Парсер документации Python')
+    """Создаёт и настраивает парсер аргументов командной строки.
+
+    Общие параметры (вывод, настройки, логирование) принимаются всеми
+    режимами, а параметры из MODE_ARGUMENTS — только своим режимом.
+    """
+    parser = ModeArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
         choices=available_modes,
@@ -25,22 +292,230 @@ def configure_argument_parser(available_modes):
         choices=(constants.PRETTY, constants.FILE),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '--max-width',
+        type=int,
+        help='Максимальная ширина колонки при выводе в виде таблицы'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=(constants.GZIP, constants.ZSTD),
+        help='Сжатие файла с результатами'
+    )
+    parser.add_argument(
+        '--keep',
+        type=positive_int,
+        help='Сколько последних файлов с результатами режима хранить'
+    )
+    parser.add_argument(
+        '--config',
+        help='Путь к TOML-файлу с настройками'
+    )
+    parser.add_argument(
+        '--set',
+        action='append',
+        default=[],
+        metavar='KEY=VALUE',
+        help='Переопределить настройку, например --set timeout=10'
+    )
+    parser.add_argument(
+        '--parser-engine',
+        choices=constants.PARSER_ENGINES,
+        help='HTML-парсер для разбора страниц'
+    )
+    parser.add_argument(
+        '--log-queue',
+        action='store_true',
+        help='Неблокирующее логирование через очередь с записью в JSON'
+    )
+    for mode in available_modes or ():
+        mode_parser = parser.add_mode_parser(mode)
+        add_arguments = MODE_ARGUMENTS.get(mode)
+        if add_arguments is not None:
+            add_arguments(mode_parser)
     return parser
 
 
-def configure_logging():
-    """Настраивает логирование с ротацией файлов и выводом в терминал."""
-    constants.LOG_DIR_NAME.mkdir(exist_ok=True)
+def coerce_setting(name, value):
+    """Приводит значение настройки к типу значения по умолчанию."""
+    if name not in Settings._fields:
+        raise ConfigError(f'Неизвестная настройка: {name}')
+    default = getattr(DEFAULT_SETTINGS, name)
+    try:
+        if isinstance(default, tuple):
+            if isinstance(value, str):
+                value = [item for item in value.split(',') if item.strip()]
+            return tuple(int(item) for item in value)
+        if isinstance(value, str) and not isinstance(default, str):
+            value = value.strip()
+        if isinstance(default, bool) or isinstance(value, bool):
+            raise TypeError('логическое значение не поддерживается')
+        if isinstance(default, (int, float)):
+            converted = type(default)(value)
+            if isinstance(default, int) and converted != float(value):
+                raise ValueError('ожидалось целое число')
+            return converted
+        return check_setting_choice(name, str(value))
+    except (TypeError, ValueError) as error:
+        raise ConfigError(
+            f'Некорректное значение настройки {name}={value!r}: {error}')
+
+
+def check_setting_choice(name, value):
+    """Проверяет, что значение входит в список допустимых для настройки."""
+    choices = SETTING_CHOICES.get(name)
+    if choices is not None and value not in choices:
+        raise ValueError(f'допустимые значения: {", ".join(choices)}')
+    return value
 
-    rotating_handler = RotatingFileHandler(
+
+def read_config_file(path):
+    """Читает настройки из TOML-файла."""
+    try:
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    except tomllib.TOMLDecodeError as error:
+        raise ConfigError(f'Ошибка в файле настроек {path}: {error}')
+
+
+def load_settings(config_path=None, overrides=(), environ=None):
+    """Собирает настройки по слоям.
+
+    Значения по умолчанию перекрываются TOML-файлом, затем переменными
+    окружения BS4_PARSER_<ИМЯ> и, наконец, параметрами --set KEY=VALUE.
+    """
+    environ = os.environ if environ is None else environ
+    values = DEFAULT_SETTINGS._asdict()
+
+    config_path = config_path or environ.get(constants.ENV_CONFIG_FILE)
+    if config_path is None and constants.CONFIG_FILE_NAME.exists():
+        config_path = constants.CONFIG_FILE_NAME
+    if config_path is not None:
+        for name, value in read_config_file(config_path).items():
+            values[name] = coerce_setting(name, value)
+
+    for name in Settings._fields:
+        env_value = environ.get(constants.ENV_PREFIX + name.upper())
+        if env_value is not None:
+            values[name] = coerce_setting(name, env_value)
+
+    for override in overrides:
+        name, separator, value = override.partition('=')
+        if not separator:
+            raise ConfigError(
+                f'Ожидалась настройка в виде KEY=VALUE: {override!r}')
+        name = name.strip().replace('-', '_')
+        values[name] = coerce_setting(name, value)
+
+    return Settings(**values)
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись лога как одну строку JSON."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TqdmHandler(logging.StreamHandler):
+    """Выводит записи в терминал, не разрывая полосы прогресса tqdm."""
+
+    def emit(self, record):
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
+
+
+class ForwardHandler(logging.Handler):
+    """Передаёт записи процессов-обработчиков логгерам текущего процесса."""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def create_rotating_handler():
+    """Создаёт обработчик лог-файла с ротацией."""
+    constants.LOG_DIR_NAME.mkdir(exist_ok=True)
+    return RotatingFileHandler(
         constants.LOG_FILE_NAME,
         maxBytes=constants.TEN_INT ** constants.SIX_INT,
-        backupCount=constants.FIVE_INT
+        backupCount=constants.FIVE_INT,
+        encoding='utf-8'
+    )
+
+
+def configure_logging(queued=False):
+    """Настраивает логирование с ротацией файлов и выводом в терминал.
+
+    При queued=True записи передаются через очередь в отдельный поток:
+    файл пишется пачками в формате JSON, и цикл парсинга не ждёт
+    дискового ввода-вывода. Возвращает запущенный QueueListener.
+    """
+    if not queued:
+        logging.basicConfig(
+            datefmt=constants.LOG_DT_FORMAT,
+            format=constants.LOG_FORMAT,
+            level=logging.INFO,
+            handlers=(create_rotating_handler(), TqdmHandler())
+        )
+        return None
+
+    rotating_handler = create_rotating_handler()
+    rotating_handler.setFormatter(
+        JsonFormatter(datefmt=constants.LOG_DT_FORMAT))
+    batch_handler = MemoryHandler(
+        capacity=constants.LOG_BATCH_SIZE,
+        flushLevel=logging.CRITICAL,
+        target=rotating_handler
     )
+    console_handler = TqdmHandler()
+    console_handler.setFormatter(logging.Formatter(
+        constants.LOG_FORMAT, datefmt=constants.LOG_DT_FORMAT))
 
-    logging.basicConfig(
-        datefmt=constants.LOG_DT_FORMAT,
-        format=constants.LOG_FORMAT,
-        level=logging.INFO,
-        handlers=(rotating_handler, logging.StreamHandler())
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, batch_handler, console_handler,
+        respect_handler_level=True
     )
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+
+def stop_logging(listener):
+    """Дописывает накопленные записи и останавливает поток логирования."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def start_worker_logging(log_queue):
+    """Принимает записи процессов-обработчиков из log_queue.
+
+    Записи передаются в обработчики текущего процесса, поэтому попадают в
+    тот же файл и терминал (в том числе при --log-queue). Возвращает
+    запущенный QueueListener.
+    """
+    listener = QueueListener(log_queue, ForwardHandler())
+    listener.start()
+    return listener
+
+
+def configure_worker_logging(log_queue):
+    """Направляет логи процесса-обработчика в очередь основного процесса."""
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
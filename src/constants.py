@@ -2,28 +2,56 @@ from pathlib import Path
 
 # --- Настройки путей ---
 BASE_DIR = Path(__file__).parent
+CONFIG_FILE_NAME = BASE_DIR / 'parser.toml'
 RESULTS_DIR_NAME = 'results'
 LOG_DIR_NAME = BASE_DIR / 'logs'
 LOG_FILE_NAME = LOG_DIR_NAME / 'parser.log'
 DOWNLOAD_DIR = BASE_DIR / 'downloads'
 DOWNLOAD_DIR_NAME = 'downloads'
 DOWNLOAD_HTML_NAME = 'download.html'
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MANIFEST_SUFFIX = '.manifest.json'
+WHATS_NEW_INDEX_PATH = BASE_DIR / 'whats_new_index.sqlite3'
+PEP_CHECKPOINT_PATH = BASE_DIR / 'pep_checkpoint.json'
+LATEST_VERSIONS_CACHE_PATH = BASE_DIR / 'latest_versions.json'
+PEP_SHARDS_PATH = BASE_DIR / 'pep_shards.sqlite3'
+PEP_HISTORY_PATH = BASE_DIR / 'pep_history.jsonl'
 
 # --- URL-адреса ---
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 MAIN_PEP_URL = 'https://peps.python.org/'
+PEP_NUMERICAL_URL = MAIN_PEP_URL + 'numerical/'
 WHATS_NEW_SLUG = 'whatsnew/'
+PYTHON_DOWNLOADS_URL = 'https://www.python.org/downloads/'
+CANONICAL_HOSTS = ('docs.python.org', 'peps.python.org', 'www.python.org')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
 
 # --- Форматы даты и логирования ---
 LOG_DT_FORMAT = '%d.%m.%Y %H:%M:%S'
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+LOG_BATCH_SIZE = 100
+
+
+# --- Переменные окружения ---
+ENV_PREFIX = 'BS4_PARSER_'
+ENV_CONFIG_FILE = 'BS4_PARSER_CONFIG'
 
 
 # --- Настройки логики обработки ---
 TABLE_ALIGN = 'l'
+PARSER_ENGINE = 'lxml'
+PARSER_ENGINES = ('lxml', 'html.parser', 'html5lib')
+BENCH_PAGES_LIMIT = 200
+OUTPUT_CHUNK_SIZE = 1000
 PRETTY = 'pretty'
 FILE = 'file'
+GZIP = 'gzip'
+ZSTD = 'zstd'
+COMPRESSION_SUFFIXES = {GZIP: '.gz', ZSTD: '.zst'}
+LATEST_POINTER_SUFFIX = '.latest'
+RESULT_FILE_MODE = 0o666
+SEARCH_RESULTS_LIMIT = 20
 
 
 # --- Паттерны для регулярных выражений ---
@@ -36,7 +64,40 @@ VERSION_PYTHON_STATUS_PATTERN = (
 TOTAL_RETRIES = 3
 STATUS_FORCE_LIST = [500, 502, 503, 504]
 BACKOFF_FACTOR = 0.3
-TIME_OUT_GET_RESPOSE = 1
+TIME_OUT_GET_RESPOSE = 5
+CACHE_BACKEND = 'sqlite'
+RATE_LIMIT = 0
+LATEST_VERSIONS_TTL = 60 * 60
+
+
+# --- Настройки HTTP API ---
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8000
+SERVE_MODES = ('pep', 'whats-new', 'latest-versions')
+WARMUP_MODES = ('pep', 'whats-new', 'latest-versions')
+SERVE_RESULTS_TTL = 5 * 60
+SERVE_STALE_TTL = 60 * 60
+
+
+# --- Обход сайта документации ---
+CRAWL_MAX_PAGES = 10_000
+CRAWL_RATE_LIMIT = 10
+CRAWL_BLOOM_CAPACITY = 1_000_000
+CRAWL_BLOOM_ERROR_RATE = 0.001
+CRAWL_USER_AGENT = 'bs4_parser_pep'
+CRAWL_PAGE_SUFFIXES = ('.html', '.htm')
+HEAD_NOT_ALLOWED = (405, 501)
+
+
+# --- Настройки параллельной обработки ---
+MAX_WORKERS = 8
+PREFETCH_DEPTH = 2 * MAX_WORKERS
+CHECKPOINT_EVERY = 25
+SHARD_SIZE = 100
+SHARD_WORKERS = 4
+SHARD_LEASE_TIMEOUT = 600
+SHARD_QUEUE_TIMEOUT = 30
+SHARD_START_METHOD = 'spawn'
 
 
 # --- Числовые константы ---
@@ -49,6 +110,16 @@ SIX_INT = 6
 TEN_INT = 10
 
 
+# --- Статусы версий на странице загрузок и в документации ---
+DOWNLOADS_STATUS_TO_DOCS = {
+    'feature': 'in development',
+    'prerelease': 'pre-release',
+    'bugfix': 'stable',
+    'security': 'security-fixes',
+    'end of life': 'EOL',
+}
+
+
 # --- Ожидаемые статусы PEP ---
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
@@ -60,3 +131,10 @@ EXPECTED_STATUS = {
     'W': ('Withdrawn',),
     '': ('Draft', 'Active'),
 }
+# Допустимые пары (ожидаемые статусы, реальный статус) для сверки статусов
+# PEP одним поиском по множеству.
+EXPECTED_STATUS_PAIRS = frozenset(
+    (expected_variants, status)
+    for expected_variants in EXPECTED_STATUS.values()
+    for status in expected_variants
+)
@@ -0,0 +1,218 @@
+import hashlib
+import logging
+import math
+import time
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+from tqdm import tqdm
+
+from src import constants, utils
+from src.configs import DEFAULT_SETTINGS
+from src.records import BrokenLink
+
+
+def is_page_url(url):
+    """Проверяет, что адрес ведёт на HTML-страницу, а не на файл."""
+    name = urlsplit(url).path.rsplit('/', constants.ONE_INT)[-1]
+    return '.' not in name or name.endswith(constants.CRAWL_PAGE_SUFFIXES)
+
+
+class BloomFilter:
+    """Компактное множество посещённых адресов.
+
+    Для capacity элементов занимает около capacity * 1.44 * log2(1 /
+    error_rate) бит, то есть ~1.8 МБ на миллион адресов при доле ложных
+    срабатываний 0.1%. Ложное срабатывание означает, что адрес будет
+    сочтён посещённым и пропущен; пропусков наоборот не бывает.
+    """
+
+    def __init__(self, capacity=constants.CRAWL_BLOOM_CAPACITY,
+                 error_rate=constants.CRAWL_BLOOM_ERROR_RATE):
+        self.size = max(constants.ONE_INT, math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(constants.ONE_INT, round(
+            self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = constants.ZERO_INT
+
+    def positions(self, item):
+        """Номера битов элемента по схеме двойного хеширования."""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | constants.ONE_INT
+        return (
+            (first + index * second) % self.size
+            for index in range(self.hash_count)
+        )
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(item)
+        )
+
+    def add(self, item):
+        """Добавляет элемент; возвращает False, если он уже был."""
+        added = False
+        for position in self.positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += constants.ONE_INT
+        return added
+
+    def __len__(self):
+        return self.count
+
+
+class Crawler:
+    """Обход сайта документации в ширину с проверкой внутренних ссылок.
+
+    Проверяются все ссылки на тот же хост, но обходятся, то есть
+    загружаются со сбором ссылок, только страницы внутри пути стартового
+    адреса; остальные проверяются запросом HEAD. Запросы идут через
+    собственную сессию без HTTP-кэша: обход должен видеть текущее
+    состояние сайта и не засорять кэш телами всех страниц. Уровни обхода
+    загружаются параллельно в пуле потоков, частота запросов
+    ограничивается адаптером сессии, а адреса, запрещённые robots.txt,
+    пропускаются.
+    """
+
+    def __init__(self, start_url=constants.MAIN_DOC_URL,
+                 max_pages=constants.CRAWL_MAX_PAGES, max_depth=None,
+                 settings=DEFAULT_SETTINGS, rate_limit=None, visited=None):
+        self.start_url = utils.canonicalize_url(start_url)
+        self.host = urlsplit(self.start_url)[:2]
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.session = utils.create_uncached_session(
+            settings,
+            rate_limit or settings.rate_limit or constants.CRAWL_RATE_LIMIT
+        )
+        self.timeout = settings.timeout
+        self.visited = BloomFilter() if visited is None else visited
+        self.robots = self.load_robots()
+        self.pages = constants.ZERO_INT
+
+    def close(self):
+        """Закрывает HTTP-сессию обхода."""
+        self.session.close()
+
+    def load_robots(self):
+        """Загружает правила robots.txt сайта, если они есть."""
+        scheme, netloc = self.host
+        robots = RobotFileParser()
+        try:
+            response = self.session.get(
+                f'{scheme}://{netloc}/robots.txt', timeout=self.timeout)
+        except Exception as error:
+            logging.warning(f'Не удалось загрузить robots.txt: {error}')
+            return None
+        if response.status_code != 200:
+            return None
+        robots.parse(response.text.splitlines())
+        return robots
+
+    def is_internal(self, url):
+        """Проверяет, что адрес ведёт на тот же хост и разрешён robots.txt."""
+        return urlsplit(url)[:2] == self.host and (
+            self.robots is None
+            or self.robots.can_fetch(constants.CRAWL_USER_AGENT, url)
+        )
+
+    def in_section(self, url):
+        """Проверяет, что страница лежит в обходимом разделе сайта."""
+        return url.startswith(self.start_url)
+
+    def fetch(self, url, follow=True):
+        """Загружает адрес и возвращает (код ответа, ответ или ошибка).
+
+        Страницы, ссылки с которых нужно собрать (follow), загружаются
+        целиком, а для остальных адресов достаточно запроса HEAD.
+        """
+        try:
+            if follow and is_page_url(url):
+                response = self.session.get(url, timeout=self.timeout)
+            else:
+                response = self.session.head(
+                    url, timeout=self.timeout, allow_redirects=True)
+                if response.status_code in constants.HEAD_NOT_ALLOWED:
+                    response = self.session.get(url, timeout=self.timeout)
+        except Exception as error:
+            return None, str(error)
+        return response.status_code, response
+
+    def check_page(self, url):
+        """Проверяет адрес и собирает ссылки со страницы раздела.
+
+        Возвращает (код ответа или None, ошибка, список ссылок).
+        """
+        follow = self.in_section(url)
+        status, response = self.fetch(url, follow)
+        if status is None:
+            return None, response, []
+        if status >= 400:
+            return status, f'HTTP {status}', []
+        if not follow or 'html' not in response.headers.get(
+                'Content-Type', ''):
+            return status, None, []
+        soup = BeautifulSoup(
+            response.content,
+            utils.get_settings(self.session).parser_engine,
+            parse_only=SoupStrainer('a', href=True)
+        )
+        links = [
+            utils.canonicalize_url(urljoin(response.url, a_tag['href']))
+            for a_tag in soup.find_all('a')
+        ]
+        utils.release_soup(soup)
+        return status, None, links
+
+    def crawl(self, executor=None):
+        """Обходит сайт и возвращает список битых внутренних ссылок.
+
+        Следующий уровень обхода не длиннее числа адресов, которые ещё
+        можно проверить до max_pages.
+        """
+        broken = []
+        frontier = [(self.start_url, self.start_url)]
+        self.visited.add(self.start_url)
+        depth = constants.ZERO_INT
+        started = time.monotonic()
+        with utils.worker_pool(executor) as pool, tqdm(
+            desc='Обход сайта', total=self.max_pages
+        ) as progress:
+            while frontier and self.pages < self.max_pages:
+                frontier = frontier[:self.max_pages - self.pages]
+                budget = self.max_pages - self.pages - len(frontier)
+                next_frontier = []
+                checked = utils.prefetch(
+                    pool, lambda entry: self.check_page(entry[0]), frontier)
+                for (url, referrer), (status, error, links) in zip(
+                        frontier, checked):
+                    self.pages += constants.ONE_INT
+                    progress.update()
+                    if error is not None:
+                        broken.append(
+                            BrokenLink(url, status or error, referrer))
+                        continue
+                    if self.max_depth is not None and depth >= self.max_depth:
+                        continue
+                    for link in links:
+                        if len(next_frontier) >= budget:
+                            break
+                        if self.is_internal(link) and self.visited.add(link):
+                            next_frontier.append((link, url))
+                frontier = next_frontier
+                depth += constants.ONE_INT
+        elapsed = time.monotonic() - started
+        logging.info(
+            f'Обход завершён: {self.pages} адресов за {elapsed:.1f} с '
+            f'({self.pages / elapsed if elapsed else 0:.1f} адресов/с), '
+            f'битых ссылок: {len(broken)}'
+        )
+        return broken
@@ -8,3 +8,11 @@ class VersionsNotFoundError(Exception):
 
 class NetworkError(Exception):
     """Ошибка при выполнении сетевого запроса."""
+
+
+class ConfigError(Exception):
+    """Ошибка в настройках парсера."""
+
+
+class ArchiveError(Exception):
+    """Архив документации повреждён или не читается."""
@@ -0,0 +1,104 @@
+import datetime as dt
+import json
+import os
+import sys
+from itertools import groupby
+
+from src import constants
+
+
+def normalize_moment(moment):
+    """Приводит дату или дату со временем к строке для сравнения с журналом.
+
+    Для даты без времени берётся конец дня, чтобы в выборку попали все
+    запуски этого дня.
+    """
+    if isinstance(moment, dt.datetime):
+        return moment.isoformat(timespec='seconds')
+    if isinstance(moment, dt.date):
+        moment = moment.isoformat()
+    parsed = dt.datetime.fromisoformat(moment)
+    if len(moment) == len('YYYY-MM-DD'):
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+    return parsed.isoformat(timespec='seconds')
+
+
+class PepHistory:
+    """Журнал изменений статусов PEP.
+
+    В файл JSON Lines дописываются только PEP, статус которых изменился с
+    прошлого запуска, поэтому размер журнала растёт с числом изменений, а
+    не с числом запусков. Состояние на любой момент восстанавливается
+    последовательным применением изменений.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or constants.PEP_HISTORY_PATH
+
+    def iter_changes(self, until=None):
+        """Выдаёт записи журнала (момент, номер, статус) по порядку."""
+        if not self.path.exists():
+            return
+        until = normalize_moment(until) if until is not None else None
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                at, number, status = json.loads(line)
+                if until is not None and at > until:
+                    return
+                yield at, number, sys.intern(status)
+
+    def statuses_at(self, moment=None):
+        """Возвращает статусы PEP на момент moment (по умолчанию текущие)."""
+        return {
+            number: status
+            for _, number, status in self.iter_changes(moment)
+        }
+
+    def record(self, statuses, at=None):
+        """Дописывает в журнал изменившиеся статусы и возвращает их число.
+
+        statuses — словарь {номер PEP: статус} текущего запуска. PEP, не
+        попавшие в запуск, считаются неизменившимися.
+        """
+        at = normalize_moment(at or dt.datetime.now())
+        previous = self.statuses_at()
+        lines = [
+            json.dumps([at, number, status], ensure_ascii=False) + '\n'
+            for number, status in sorted(statuses.items())
+            if previous.get(number) != status
+        ]
+        if not lines:
+            return constants.ZERO_INT
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def transitions(self, number):
+        """Возвращает список (момент, статус) изменений одного PEP."""
+        return [
+            (at, status)
+            for at, pep_number, status in self.iter_changes()
+            if pep_number == number
+        ]
+
+    def counts_over_time(self, until=None):
+        """Выдаёт (момент, {статус: число PEP}) после каждого запуска."""
+        statuses = {}
+        counts = {}
+        for at, changes in groupby(
+                self.iter_changes(until), key=lambda change: change[0]):
+            for _, number, status in changes:
+                old_status = statuses.get(number)
+                if old_status is not None:
+                    counts[old_status] -= constants.ONE_INT
+                statuses[number] = status
+                counts[status] = counts.get(
+                    status, constants.DEFAULT_INT) + constants.ONE_INT
+            yield at, {
+                status: count for status, count in counts.items() if count
+            }
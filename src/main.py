@@ -1,73 +1,249 @@
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
 from urllib.parse import urljoin
 
-from src import constants, utils
-from src.configs import configure_argument_parser, configure_logging
+from src import (archive, constants, parser_bench, server, shards, utils,
+                 warmup, whats_new_index)
+from src.checkpoint import PepCheckpoint
+from src.configs import (DEFAULT_SETTINGS, configure_argument_parser,
+                         configure_logging, get_mode_options, load_settings,
+                         stop_logging)
+from src.crawler import Crawler
 from src.exceptions import VersionsNotFoundError
+from src.history import PepHistory
 from src.outputs import control_output
+from src.records import StatusCount, WhatsNewEntry
 
 BASE_DIR = constants.BASE_DIR
 
 
-def pep(session):
+def pep(session, resume=False, executor=None):
     """Парсинг PEP и подсчет статусов."""
     rows, base_url = utils.get_pep_rows(session)
 
     if not rows:
         logging.warning("PEP-таблица пуста или не получена.")
         return
+    checkpoint = PepCheckpoint.load() if resume else PepCheckpoint()
     status_counter, inappropriate_statuses, total, = utils.analyze_peps(
-        session, (rows, base_url)
+        session, (rows, base_url), checkpoint, executor
     )
+    checkpoint.remove()
+    changes = PepHistory().record({
+        number: pep_status.real_status
+        for number, pep_status in checkpoint.statuses.items()
+    })
+    logging.info(f'В журнал статусов PEP записано изменений: {changes}')
     utils.log_inappropriate_statuses(inappropriate_statuses)
-    result = (
-        [['Status', 'Count']]
-        + [list(item) for item in sorted(status_counter.items())]
-        + [['Total', total]]
+    return make_pep_results(status_counter, total)
+
+
+def make_pep_results(status_counter, total):
+    """Строки таблицы с количеством PEP по статусам."""
+    return (
+        [StatusCount('Status', 'Count')]
+        + [StatusCount(*item) for item in sorted(status_counter.items())]
+        + [StatusCount('Total', total)]
     )
-    return result
 
 
-def whats_new(session):
-    """Сбор новостей о Python."""
-    soup = utils.fetch_and_parse(session, constants.MAIN_DOC_URL,
-                                 constants.WHATS_NEW_SLUG)
+def pep_history(session, at=None, pep_number=None):
+    """Статусы PEP во времени по журналу изменений.
+
+    Без параметров выводит число PEP по статусам после каждого запуска
+    pep, с at — состояние на указанную дату, с pep_number — историю
+    изменений статуса одного PEP.
+    """
+    history = PepHistory()
+    if pep_number is not None:
+        return [('Дата', 'Статус')] + history.transitions(pep_number)
+    if at is not None:
+        status_counter = Counter(history.statuses_at(at).values())
+        return make_pep_results(
+            status_counter, sum(status_counter.values()))
+    series = list(history.counts_over_time())
+    statuses = sorted({status for _, counts in series for status in counts})
+    return [('Дата', *statuses, 'Total')] + [
+        (
+            moment,
+            *(counts.get(status, constants.ZERO_INT) for status in statuses),
+            sum(counts.values()),
+        )
+        for moment, counts in series
+    ]
 
-    sections = utils.get_python_new_features_sections(soup)
 
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, автор')]
+def warm_cache(session, warm_modes=constants.WARMUP_MODES, executor=None,
+               import_cache=None, export_cache=None):
+    """Прогрев HTTP-кэша страницами, нужными выбранным режимам.
+
+    Сначала в кэш добавляются записи из файла import_cache, затем
+    загружаются недостающие и устаревшие страницы. С export_cache итоговый
+    кэш выгружается в файл, который можно импортировать на другой машине.
+    """
+    if import_cache is not None:
+        imported = warmup.import_cache_bundle(session, import_cache)
+        logging.info(f'Импортировано записей кэша: {imported}')
+    results = [('Режим', 'Адресов', 'Уже в кэше', 'Загружено', 'Ошибок')]
     results.extend(
-        utils.parse_whats_new_sections(
-            session,
-            sections,
-            urljoin(constants.MAIN_DOC_URL, constants.WHATS_NEW_SLUG)
+        warmup.warm_mode(session, mode, executor) for mode in warm_modes)
+    if export_cache is not None:
+        exported = warmup.export_cache_bundle(session, export_cache)
+        logging.info(
+            f'Выгружено записей кэша: {exported} в файл {export_cache}')
+    return results
+
+
+def crawl(session, start_url=constants.MAIN_DOC_URL,
+          max_pages=constants.CRAWL_MAX_PAGES, max_depth=None,
+          executor=None):
+    """Проверка внутренних ссылок сайта документации."""
+    with closing(Crawler(start_url, max_pages, max_depth,
+                         utils.get_settings(session))) as crawler:
+        broken = crawler.crawl(executor)
+    return [('Ссылка', 'Статус', 'Найдена на странице')] + broken
+
+
+def pep_shards(session, session_factory, queue=None,
+               workers=constants.SHARD_WORKERS,
+               shard_size=constants.SHARD_SIZE, resume=False):
+    """Подсчёт статусов PEP несколькими процессами по шардам.
+
+    Таблица PEP делится на шарды по диапазонам номеров и записывается в
+    очередь SQLite. Локальные процессы (и обработчики pep-worker на других
+    машинах с доступом к файлу очереди) разбирают шарды, после чего
+    частичные результаты объединяются в итоговую таблицу. С resume
+    очередь не пересоздаётся и обрабатываются только оставшиеся шарды.
+    """
+    with shards.ShardQueue(queue) as shard_queue:
+        if not resume:
+            rows, base_url = utils.get_pep_rows(session)
+            pep_refs = [
+                pep_ref for pep_ref in (
+                    utils.parse_pep_row(row, base_url)
+                    for row in rows[constants.ONE_INT:]
+                )
+                if pep_ref is not None
+            ]
+            shard_queue.fill(shards.split_into_shards(pep_refs, shard_size))
+        shards.run_workers(session_factory, shard_queue.path, workers)
+        unfinished = shard_queue.count_unfinished()
+        if unfinished:
+            logging.warning(
+                f'Не обработано шардов: {unfinished}. Запустите команду '
+                'повторно с --resume.'
+            )
+        status_counter, inappropriate_statuses, total = shard_queue.reduce()
+    utils.log_inappropriate_statuses(inappropriate_statuses)
+    return make_pep_results(status_counter, total)
+
+
+def pep_worker(session, queue=None):
+    """Обработка шардов PEP из общей очереди."""
+    processed = shards.run_worker(session, queue)
+    logging.info(f'Обработано шардов: {processed}')
+
+
+def whats_new(session, executor=None):
+    """Сбор новостей о Python."""
+    results = [
+        WhatsNewEntry('Ссылка на статью', 'Заголовок', 'Редактор, автор')
+    ]
+    with utils.parsed_page(session, constants.MAIN_DOC_URL,
+                           constants.WHATS_NEW_SLUG) as soup:
+        sections = utils.get_python_new_features_sections(soup)
+        results.extend(
+            utils.parse_whats_new_sections(
+                session,
+                sections,
+                urljoin(constants.MAIN_DOC_URL, constants.WHATS_NEW_SLUG),
+                executor
+            )
         )
-    )
     return results
 
 
-def latest_versions(session):
-    """Получение последних версий Python."""
-    soup = utils.fetch_and_parse(session, constants.MAIN_DOC_URL)
+def latest_versions(session, check_downloads=False):
+    """Получение последних версий Python.
 
-    ul_tags = utils.get_sidebar_ul_tags(soup)
+    Результат хранится локально в течение LATEST_VERSIONS_TTL секунд,
+    повторные вызовы в этот период не обращаются к сети.
+    """
+    entries = utils.load_cached_versions()
+    if entries is None:
+        with utils.parsed_page(session, constants.MAIN_DOC_URL) as soup:
+            versions_ul = utils.get_all_versions_ul(soup)
+            if versions_ul is None:
+                raise VersionsNotFoundError('Список версий Python не найден')
+            entries = utils.parse_versions_list(versions_ul)
+        utils.save_cached_versions(entries)
 
-    for ul in ul_tags:
-        if 'All versions' in ul.text:
-            return utils.parse_versions_list(ul)
-    raise VersionsNotFoundError('Список версий Python не найден')
+    if check_downloads:
+        utils.check_versions_against_downloads(session, entries)
+    return entries
 
 
-def download(session):
-    """Загрузка документации и сохранение в папке."""
-    utils.fetch_and_parse(
-        session, constants.MAIN_DOC_URL, constants.DOWNLOAD_HTML_NAME)
+def download(session, verify=False, extract=None):
+    """Загрузка документации и сохранение в папке.
 
+    С verify архив проверяется по контрольным суммам. Рядом с архивом
+    сохраняется манифест (имя, размер и CRC файлов), а с extract из архива
+    распаковываются только файлы, подходящие под шаблоны.
+    """
     save_dir = BASE_DIR / constants.DOWNLOAD_DIR_NAME
-    utils.download_pdf_archive(
+    archive_path = utils.download_pdf_archive(
         session, constants.MAIN_DOC_URL, save_dir)
+    if not (verify or extract):
+        return
+    entries = archive.load_manifest(archive_path, verify)
+    if extract:
+        archive.extract_members(
+            archive_path, extract, save_dir / archive_path.stem, entries)
 
 
+def index_whats_new(session, executor=None):
+    """Инкрементальная индексация разделов 'Что нового' для поиска."""
+    with utils.parsed_page(session, constants.MAIN_DOC_URL,
+                           constants.WHATS_NEW_SLUG) as soup, \
+            closing(whats_new_index.open_index()) as connection:
+        sections = utils.get_python_new_features_sections(soup)
+        counts = whats_new_index.build_index(
+            session,
+            connection,
+            sections,
+            urljoin(constants.MAIN_DOC_URL, constants.WHATS_NEW_SLUG),
+            executor
+        )
+    return [('Переиндексировано', 'Без изменений', 'Удалено'), counts]
+
+
+def search_whats_new(session, query):
+    """Поиск по локальному индексу 'Что нового' без сетевых запросов."""
+    with closing(whats_new_index.open_index()) as connection:
+        found = whats_new_index.search_index(connection, query)
+    return [('Версия', 'Раздел', 'Ссылка', 'Фрагмент')] + found
+
+
+def bench_parsers(session):
+    """Сравнение HTML-парсеров на сохранённых в кэше страницах."""
+    pages = parser_bench.get_recorded_pages(session)
+    if not pages:
+        logging.warning(
+            'В кэше нет сохранённых страниц: сначала запустите любой режим.')
+        return None
+    results = parser_bench.benchmark_parsers(
+        pages,
+        parser_bench.available_parser_engines(),
+        reference=utils.get_settings(session).parser_engine
+    )
+    return [('Парсер', 'Страниц', 'Страниц/с', 'Совпадений')] + results
+
+
+# Функции исходных режимов для вызова с готовой сессией без объекта
+# Parser. Список режимов CLI и их запуск берутся из методов Parser.
 MODE_TO_FUNCTION = {
     'whats-new': whats_new,
     'latest-versions': latest_versions,
@@ -76,27 +252,162 @@ MODE_TO_FUNCTION = {
 }
 
 
+def parser_mode(method):
+    """Помечает метод Parser как режим работы с именем через дефис."""
+    method.mode = method.__name__.replace('_', '-')
+    return method
+
+
+class Parser:
+    """Парсер документации Python для многократного вызова из кода.
+
+    Одна HTTP-сессия с кэшем и пул потоков живут столько же, сколько
+    объект, поэтому повторные вызовы режимов не тратят время на их
+    создание. Методы возвращают те же строки-записи, что и режимы CLI.
+    """
+
+    def __init__(self, session=None, settings=DEFAULT_SETTINGS):
+        self.settings = settings
+        self.session = session or utils.create_session_with_retries(settings)
+        self.executor = ThreadPoolExecutor(max_workers=settings.max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Останавливает пул потоков и закрывает HTTP-сессию."""
+        self.executor.shutdown()
+        self.session.close()
+
+    def clear_cache(self):
+        """Очищает HTTP-кэш и сохранённый список версий."""
+        self.session.cache.clear()
+        utils.clear_cached_versions()
+
+    def run(self, mode, **options):
+        """Запускает режим по имени, как оно задаётся в командной строке."""
+        method = MODES.get(mode)
+        if method is None:
+            raise ValueError(f'Неизвестный режим: {mode}')
+        coalescer = getattr(self.session, 'coalescer', None)
+        stats_before = coalescer.snapshot() if coalescer else None
+        try:
+            return method(self, **options)
+        finally:
+            if coalescer is not None:
+                utils.log_dedup_summary(coalescer.snapshot() - stats_before)
+
+    @parser_mode
+    def pep(self, resume=False):
+        """Подсчёт статусов PEP."""
+        return pep(self.session, resume=resume, executor=self.executor)
+
+    @parser_mode
+    def whats_new(self):
+        """Сбор новостей о Python."""
+        return whats_new(self.session, self.executor)
+
+    @parser_mode
+    def latest_versions(self, check_downloads=False):
+        """Получение последних версий Python."""
+        return latest_versions(self.session, check_downloads)
+
+    @parser_mode
+    def download(self, verify=False, extract=None):
+        """Загрузка архива документации."""
+        return download(self.session, verify, extract)
+
+    @parser_mode
+    def whats_new_index(self):
+        """Индексация разделов 'Что нового'."""
+        return index_whats_new(self.session, self.executor)
+
+    @parser_mode
+    def whats_new_search(self, query):
+        """Поиск по индексу 'Что нового'."""
+        return search_whats_new(self.session, query)
+
+    @parser_mode
+    def bench_parsers(self):
+        """Сравнение HTML-парсеров на сохранённых страницах."""
+        return bench_parsers(self.session)
+
+    @parser_mode
+    def pep_shards(self, queue=None, workers=constants.SHARD_WORKERS,
+                   shard_size=constants.SHARD_SIZE, resume=False):
+        """Подсчёт статусов PEP несколькими процессами по шардам."""
+        return pep_shards(
+            self.session,
+            partial(utils.create_session_with_retries, self.settings),
+            queue, workers, shard_size, resume
+        )
+
+    @parser_mode
+    def pep_worker(self, queue=None):
+        """Обработка шардов PEP из общей очереди."""
+        return pep_worker(self.session, queue)
+
+    @parser_mode
+    def pep_history(self, at=None, pep_number=None):
+        """Статусы PEP во времени по журналу изменений."""
+        return pep_history(self.session, at, pep_number)
+
+    @parser_mode
+    def warm_cache(self, warm_modes=constants.WARMUP_MODES,
+                   import_cache=None, export_cache=None):
+        """Прогрев HTTP-кэша страницами выбранных режимов."""
+        return warm_cache(self.session, warm_modes, self.executor,
+                          import_cache, export_cache)
+
+    @parser_mode
+    def crawl(self, start_url=constants.MAIN_DOC_URL,
+              max_pages=constants.CRAWL_MAX_PAGES, max_depth=None):
+        """Проверка внутренних ссылок сайта документации."""
+        return crawl(self.session, start_url, max_pages, max_depth,
+                     self.executor)
+
+    @parser_mode
+    def serve(self, host=constants.SERVE_HOST, port=constants.SERVE_PORT):
+        """Обслуживание результатов режимов через локальный HTTP API."""
+        server.serve(self, host, port)
+
+
+# Режимы работы по имени в командной строке: методы Parser,
+# отмеченные parser_mode.
+MODES = {
+    method.mode: method
+    for method in vars(Parser).values()
+    if hasattr(method, 'mode')
+}
+
+AVAILABLE_MODES = tuple(MODES)
+
+
 def main():
     """Точка входа в приложение."""
+    log_listener = None
     try:
-        configure_logging()
-        logging.info('Парсер запущен!')
-
-        arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
+        arg_parser = configure_argument_parser(AVAILABLE_MODES)
         args = arg_parser.parse_args()
-        logging.info(f'Аргументы командной строки: {args}')
-
-        parser_mode = args.mode
-        if parser_mode not in MODE_TO_FUNCTION:
-            logging.error(f'Неизвестный режим: {parser_mode}')
-            return
 
-        session = utils.create_session_with_retries()
+        log_listener = configure_logging(queued=args.log_queue)
+        logging.info('Парсер запущен!')
+        logging.info(f'Аргументы командной строки: {args}')
 
-        if args.clear_cache:
-            session.cache.clear()
+        overrides = list(args.set)
+        if args.parser_engine:
+            overrides.append(f'parser_engine={args.parser_engine}')
+        settings = load_settings(args.config, overrides)
+        logging.info(f'Действующие настройки: {settings._asdict()}')
 
-        results = MODE_TO_FUNCTION[parser_mode](session)
+        options = get_mode_options(arg_parser, args)
+        with Parser(settings=settings) as parser:
+            if args.clear_cache:
+                parser.clear_cache()
+            results = parser.run(args.mode, **options)
 
         if results is not None:
             control_output(results, args)
@@ -105,6 +416,9 @@ def main():
 
     except Exception as error:
         logging.exception(f'Во время выполнения произошла ошибка: {error}')
+    finally:
+        if log_listener is not None:
+            stop_logging(log_listener)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,23 @@
 import csv
 import datetime as dt
+import gzip
+import io
 import logging
+import os
+import re
+import sys
+import tempfile
+from itertools import islice
 
-from prettytable import PrettyTable
+import wcwidth
 
 from src import constants
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 BASE_DIR = constants.BASE_DIR
 
 
@@ -20,32 +32,166 @@ def control_output(results, cli_args):
     handler(results, cli_args)
 
 
+def write_lines(lines, chunk_size=constants.OUTPUT_CHUNK_SIZE):
+    """Пишет строки в stdout крупными блоками вместо вызова print на строку."""
+    stream = sys.stdout
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            break
+        stream.write('\n'.join(chunk) + '\n')
+    stream.flush()
+
+
 def default_output(results, cli_args=None):
     """Построчный вывод результатов в терминал."""
-    for row in results:
-        print(*row)
+    write_lines(' '.join(map(str, row)) for row in results)
+
+
+def format_cell(value, max_width=None):
+    """Приводит значение к одной строке и при необходимости обрезает его."""
+    text = str(value).replace('\n', ' ')
+    if max_width and len(text) > max_width:
+        return text[:max_width - constants.ONE_INT] + '…'
+    return text
+
+
+def text_width(text):
+    """Ширина текста в терминале, посчитанная так же, как в PrettyTable.
+
+    Широкие символы (CJK) занимают две позиции, комбинируемые — ни одной.
+    """
+    if text.isascii():
+        return len(text)
+    return max(wcwidth.wcswidth(text), constants.ZERO_INT)
+
+
+def iter_table_lines(results, max_width=None):
+    """Формирует строки таблицы в формате PrettyTable.
+
+    Ширины колонок вычисляются за один проход по уже отформатированным
+    ячейкам, после чего строки таблицы выдаются по одной.
+    """
+    rows = [[format_cell(value, max_width) for value in row]
+            for row in results]
+    if not rows:
+        return
+    cell_widths = [[text_width(cell) for cell in row] for row in rows]
+    widths = [max(column) for column in zip(*cell_widths)]
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    def format_row(row, row_widths):
+        return '| ' + ' | '.join(
+            cell + ' ' * (width - cell_width)
+            for cell, cell_width, width in zip(row, row_widths, widths)
+        ) + ' |'
+
+    yield border
+    yield format_row(rows[constants.ZERO_INT], cell_widths[constants.ZERO_INT])
+    yield border
+    for row, row_widths in zip(
+            rows[constants.ONE_INT:], cell_widths[constants.ONE_INT:]):
+        yield format_row(row, row_widths)
+    yield border
 
 
 def pretty_output(results, cli_args=None):
     """Вывод результатов в виде красиво отформатированной таблицы."""
-    table = PrettyTable()
-    table.field_names = results[constants.ZERO_INT]
-    table.align = constants.TABLE_ALIGN
-    table.add_rows(results[constants.ONE_INT:])
-    print(table)
+    max_width = getattr(cli_args, 'max_width', None)
+    write_lines(iter_table_lines(results, max_width))
+
+
+def open_compressed(raw_file, compression):
+    """Оборачивает бинарный файл в поток сжатия выбранного формата."""
+    if compression == constants.GZIP:
+        return gzip.GzipFile(fileobj=raw_file, mode='wb', filename='')
+    if compression == constants.ZSTD:
+        if zstandard is None:
+            raise ImportError('Для сжатия zstd установите пакет zstandard')
+        return zstandard.ZstdCompressor().stream_writer(
+            raw_file, closefd=False)
+    return None
+
+
+def get_umask():
+    """Возвращает текущую маску прав создаваемых файлов."""
+    umask = os.umask(constants.ZERO_INT)
+    os.umask(umask)
+    return umask
+
+
+def write_atomically(file_path, write, compression=None, encoding='utf-8'):
+    """Пишет файл через временный файл и атомарно переименовывает его.
+
+    При сбое во время записи на месте результата не остаётся обрезанного
+    файла: временный файл удаляется, а прежние результаты не меняются.
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f'.{file_path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as raw_file:
+            compressed = open_compressed(raw_file, compression)
+            text_file = io.TextIOWrapper(
+                compressed or raw_file, encoding=encoding)
+            write(text_file)
+            text_file.flush()
+            text_file.detach()
+            if compressed is not None:
+                compressed.close()
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        os.chmod(tmp_name, constants.RESULT_FILE_MODE & ~get_umask())
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def remove_old_results(results_dir, parser_mode, keep):
+    """Оставляет в папке только keep последних файлов результатов режима."""
+    pattern = re.compile(
+        rf'{re.escape(parser_mode)}_\d{{4}}(-\d\d){{2}}_\d\d(-\d\d){{2}}'
+        r'\.csv(\.gz|\.zst)?'
+    )
+    files = sorted(
+        path for path in results_dir.iterdir()
+        if pattern.fullmatch(path.name)
+    )
+    for path in files[:-keep]:
+        path.unlink()
+        logging.info(f'Удалён устаревший файл с результатами: {path}')
 
 
 def file_output(results, cli_args, encoding='utf-8', dialect='unix'):
-    """Сохранение результатов в CSV-файл в папке results."""
+    """Сохранение результатов в CSV-файл в папке results.
+
+    Файл записывается атомарно и при необходимости сжимается. Имя
+    последнего файла режима хранится в {режим}.latest, поэтому его можно
+    найти без просмотра всей папки.
+    """
     results_dir = BASE_DIR / constants.RESULTS_DIR_NAME
     results_dir.mkdir(exist_ok=True)
     parser_mode = cli_args.mode
+    compression = getattr(cli_args, 'compress', None)
+    keep = getattr(cli_args, 'keep', None)
     now = dt.datetime.now()
     now_formatted = now.strftime(constants.DATETIME_FORMAT)
-    file_name = f'{parser_mode}_{now_formatted}.csv'
+    suffix = constants.COMPRESSION_SUFFIXES.get(compression, '')
+    file_name = f'{parser_mode}_{now_formatted}.csv{suffix}'
     file_path = results_dir / file_name
 
-    with open(file_path, 'w', encoding=encoding) as f:
-        writer = csv.writer(f, dialect=dialect)
-        writer.writerows(results)
+    write_atomically(
+        file_path,
+        lambda f: csv.writer(f, dialect=dialect).writerows(results),
+        compression=compression,
+        encoding=encoding
+    )
+    write_atomically(
+        results_dir / f'{parser_mode}{constants.LATEST_POINTER_SUFFIX}',
+        lambda f: f.write(file_name + '\n')
+    )
+    if keep:
+        remove_old_results(results_dir, parser_mode, keep)
     logging.info(f'Файл с результатами был сохранён: {file_path}')
@@ -0,0 +1,75 @@
+import time
+from itertools import islice
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from src import constants, utils
+from src.records import ParserBenchmark
+
+
+def available_parser_engines(engines=constants.PARSER_ENGINES):
+    """Возвращает HTML-парсеры из списка, установленные в окружении."""
+    available = []
+    for engine in engines:
+        try:
+            BeautifulSoup('', engine)
+        except FeatureNotFound:
+            continue
+        available.append(engine)
+    return available
+
+
+def get_recorded_pages(session, limit=constants.BENCH_PAGES_LIMIT):
+    """Возвращает HTML-страницы, сохранённые в кэше сессии."""
+    html_responses = (
+        response for response in session.cache.filter()
+        if 'html' in response.headers.get('Content-Type', '')
+    )
+    return [response.text for response in islice(html_responses, limit)]
+
+
+def page_fingerprint(soup):
+    """Возвращает значения, которые парсер извлекает из страницы."""
+    h1 = soup.find('h1')
+    dl = soup.find('dl')
+    return (
+        h1.get_text(strip=True) if h1 else None,
+        utils.extract_status_from_dl(dl) if dl else None,
+        len(soup.find_all('a')),
+        len(soup.find_all('section')),
+    )
+
+
+def parse_pages(pages, engine):
+    """Разбирает страницы парсером и возвращает их отпечатки."""
+    fingerprints = []
+    for page in pages:
+        soup = BeautifulSoup(page, engine)
+        fingerprints.append(page_fingerprint(soup))
+        utils.release_soup(soup)
+    return fingerprints
+
+
+def benchmark_parsers(pages, engines, reference=constants.PARSER_ENGINE):
+    """Сравнивает скорость парсеров и совпадение извлечённых данных.
+
+    Эталоном служат результаты парсера reference: для каждого парсера
+    считается, на скольких страницах его результат совпал с эталоном.
+    """
+    expected = parse_pages(pages, reference)
+    results = []
+    for engine in engines:
+        started = time.perf_counter()
+        fingerprints = parse_pages(pages, engine)
+        elapsed = time.perf_counter() - started
+        results.append(ParserBenchmark(
+            engine=engine,
+            pages=len(pages),
+            pages_per_second=round(len(pages) / elapsed, 1) if elapsed else 0,
+            matches=sum(
+                got == want for got, want in zip(fingerprints, expected)
+            ),
+        ))
+    return sorted(
+        results, key=lambda result: (-result.matches, -result.pages_per_second)
+    )
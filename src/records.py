@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+# Строки результатов режимов. namedtuple хранит поля в слотах и не
+# заводит __dict__ на каждый экземпляр, поэтому большие выборки компактны.
+StatusCount = namedtuple('StatusCount', ('status', 'count'))
+WhatsNewEntry = namedtuple('WhatsNewEntry', ('link', 'title', 'author'))
+
+
+class VersionEntry(namedtuple('VersionEntry', ('link', 'version', 'status'))):
+    """Строка списка версий Python."""
+
+    __slots__ = ()
+
+    @property
+    def number(self):
+        """Номер версии в виде кортежа чисел, пригодного для сортировки.
+
+        Для строк без номера версии (например, 'All versions') возвращается
+        пустой кортеж, который при сортировке оказывается первым.
+        """
+        parts = self.version.split('.')
+        if not all(part.isdigit() for part in parts):
+            return ()
+        return tuple(int(part) for part in parts)
+
+
+ParserBenchmark = namedtuple(
+    'ParserBenchmark', ('engine', 'pages', 'pages_per_second', 'matches')
+)
+WarmupStats = namedtuple(
+    'WarmupStats', ('mode', 'urls', 'fresh', 'fetched', 'errors')
+)
+BrokenLink = namedtuple('BrokenLink', ('url', 'status', 'referrer'))
+ArchiveEntry = namedtuple(
+    'ArchiveEntry', ('name', 'size', 'compressed_size', 'crc')
+)
+
+
+# Промежуточные записи обработки PEP. Хранят только строки, а не теги
+# BeautifulSoup, чтобы не удерживать в памяти деревья разобранных страниц.
+PepRef = namedtuple('PepRef', ('number', 'preview_status', 'url'))
+PepStatus = namedtuple(
+    'PepStatus', ('number', 'url', 'real_status', 'expected_variants')
+)
+StatusMismatch = namedtuple(
+    'StatusMismatch', ('pep_url', 'expected_variants', 'real_status')
+)
+PepError = namedtuple('PepError', ('number', 'url', 'reason'))
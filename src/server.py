@@ -0,0 +1,130 @@
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src import constants
+
+CacheEntry = namedtuple('CacheEntry', ('results', 'computed_at'))
+
+
+class ResultCache:
+    """Кэш результатов режимов в памяти.
+
+    Свежий результат (моложе ttl) отдаётся сразу. Устаревший, но моложе
+    ttl + stale_ttl, тоже отдаётся сразу, а в фоне запускается его
+    пересчёт. Одновременные запросы одного режима ждут одно вычисление.
+    """
+
+    def __init__(self, compute, ttl=constants.SERVE_RESULTS_TTL,
+                 stale_ttl=constants.SERVE_STALE_TTL):
+        self.compute = compute
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.entries = {}
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(constants.SERVE_MODES),
+            thread_name_prefix='result-cache'
+        )
+
+    def get(self, mode):
+        """Возвращает результат режима, при необходимости вычисляя его."""
+        with self.lock:
+            entry = self.entries.get(mode)
+            if entry is not None:
+                age = time.monotonic() - entry.computed_at
+                if age < self.ttl:
+                    return entry.results
+                if age < self.ttl + self.stale_ttl:
+                    self.refresh(mode)
+                    return entry.results
+            future = self.refresh(mode)
+        return future.result()
+
+    def refresh(self, mode):
+        """Запускает пересчёт режима, если он ещё не выполняется.
+
+        Вызывается под self.lock.
+        """
+        future = self.in_flight.get(mode)
+        if future is None:
+            future = self.executor.submit(self.compute_entry, mode)
+            self.in_flight[mode] = future
+        return future
+
+    def compute_entry(self, mode):
+        """Вычисляет результат режима и сохраняет его в кэше."""
+        try:
+            results = self.compute(mode)
+            with self.lock:
+                self.entries[mode] = CacheEntry(results, time.monotonic())
+            return results
+        except Exception as error:
+            logging.exception(f'Ошибка при вычислении режима {mode}: {error}')
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(mode, None)
+
+    def close(self):
+        """Останавливает фоновые вычисления."""
+        self.executor.shutdown()
+
+
+class ResultsRequestHandler(BaseHTTPRequestHandler):
+    """Отдаёт результаты режимов парсера в формате JSON."""
+
+    def do_GET(self):
+        mode = self.path.split('?', 1)[0].strip('/')
+        if not mode:
+            return self.send_json(
+                HTTPStatus.OK, {'modes': list(constants.SERVE_MODES)})
+        if mode not in constants.SERVE_MODES:
+            return self.send_json(
+                HTTPStatus.NOT_FOUND, {'error': f'Неизвестный режим: {mode}'})
+        try:
+            results = self.server.result_cache.get(mode)
+        except Exception as error:
+            return self.send_json(
+                HTTPStatus.BAD_GATEWAY, {'error': str(error)})
+        return self.send_json(
+            HTTPStatus.OK, {'mode': mode, 'results': results})
+
+    def send_json(self, status, payload):
+        """Отправляет ответ с JSON-телом."""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.info(f'{self.address_string()} - {format % args}')
+
+
+def create_server(parser, host=constants.SERVE_HOST,
+                  port=constants.SERVE_PORT):
+    """Создаёт HTTP-сервер, общий для всех клиентов экземпляр парсера."""
+    server = ThreadingHTTPServer((host, port), ResultsRequestHandler)
+    server.result_cache = ResultCache(parser.run)
+    return server
+
+
+def serve(parser, host=constants.SERVE_HOST, port=constants.SERVE_PORT):
+    """Обслуживает запросы к результатам режимов до остановки по Ctrl-C."""
+    server = create_server(parser, host, port)
+    logging.info(f'Сервер запущен: http://{host}:{server.server_port}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info('Сервер остановлен.')
+    finally:
+        server.server_close()
+        server.result_cache.close()
@@ -0,0 +1,242 @@
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from src import constants, utils
+from src.configs import configure_worker_logging, start_worker_logging
+from src.records import PepRef, StatusMismatch
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY,
+    first_number INTEGER NOT NULL,
+    last_number INTEGER NOT NULL,
+    refs TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    claimed_at REAL,
+    status_counter TEXT,
+    mismatches TEXT,
+    total INTEGER
+);
+'''
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+
+
+def pep_sort_key(pep_ref):
+    """Ключ сортировки PEP по номеру."""
+    return int(pep_ref.number) if pep_ref.number.isdigit() else -1
+
+
+def split_into_shards(pep_refs, shard_size=constants.SHARD_SIZE):
+    """Делит PEP на шарды по диапазонам номеров."""
+    pep_refs = sorted(pep_refs, key=pep_sort_key)
+    return [
+        pep_refs[start:start + shard_size]
+        for start in range(constants.ZERO_INT, len(pep_refs), shard_size)
+    ]
+
+
+class ShardQueue:
+    """Очередь шардов PEP в файле SQLite, общая для процессов-обработчиков.
+
+    Обработчик забирает шард в отдельной транзакции BEGIN IMMEDIATE, поэтому
+    один шард не достанется двум процессам. Шард, который обработчик взял и
+    не завершил за lease_timeout секунд, снова выдаётся другим.
+    """
+
+    def __init__(self, path=None, lease_timeout=constants.SHARD_LEASE_TIMEOUT):
+        self.path = path or constants.PEP_SHARDS_PATH
+        self.lease_timeout = lease_timeout
+        self.connection = sqlite3.connect(
+            self.path, timeout=constants.SHARD_QUEUE_TIMEOUT,
+            isolation_level=None
+        )
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Закрывает соединение с файлом очереди."""
+        self.connection.close()
+
+    def fill(self, shards):
+        """Заменяет содержимое очереди новыми шардами."""
+        with self.transaction():
+            self.connection.execute('DELETE FROM shards')
+            self.connection.executemany(
+                'INSERT INTO shards (first_number, last_number, refs) '
+                'VALUES (?, ?, ?)',
+                (
+                    (
+                        pep_sort_key(shard[constants.ZERO_INT]),
+                        pep_sort_key(shard[-constants.ONE_INT]),
+                        json.dumps(shard, ensure_ascii=False),
+                    )
+                    for shard in shards
+                )
+            )
+
+    def claim(self, worker):
+        """Забирает следующий свободный шард; None, если таких не осталось."""
+        now = time.time()
+        with self.transaction():
+            row = self.connection.execute(
+                'SELECT id, refs FROM shards '
+                'WHERE state = ? OR (state = ? AND claimed_at < ?) '
+                'ORDER BY id LIMIT 1',
+                (PENDING, RUNNING, now - self.lease_timeout)
+            ).fetchone()
+            if row is None:
+                return None
+            shard_id, refs = row
+            self.connection.execute(
+                'UPDATE shards SET state = ?, worker = ?, claimed_at = ? '
+                'WHERE id = ?',
+                (RUNNING, worker, now, shard_id)
+            )
+        return shard_id, [PepRef(*ref) for ref in json.loads(refs)]
+
+    def complete(self, shard_id, status_counter, mismatches, total):
+        """Сохраняет частичный результат шарда."""
+        with self.transaction():
+            self.connection.execute(
+                'UPDATE shards SET state = ?, status_counter = ?, '
+                'mismatches = ?, total = ? WHERE id = ?',
+                (
+                    DONE,
+                    json.dumps(status_counter, ensure_ascii=False),
+                    json.dumps(mismatches, ensure_ascii=False),
+                    total,
+                    shard_id,
+                )
+            )
+
+    def count_unfinished(self):
+        """Возвращает число шардов, ещё не обработанных до конца."""
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM shards WHERE state != ?', (DONE,)
+        ).fetchone()[constants.ZERO_INT]
+
+    def reduce(self):
+        """Объединяет частичные результаты всех завершённых шардов."""
+        status_counter = Counter()
+        inappropriate_statuses = []
+        total = constants.ZERO_INT
+        rows = self.connection.execute(
+            'SELECT status_counter, mismatches, total FROM shards '
+            'WHERE state = ? ORDER BY id', (DONE,)
+        )
+        for shard_counter, shard_mismatches, shard_total in rows:
+            status_counter.update(json.loads(shard_counter))
+            inappropriate_statuses.extend(
+                StatusMismatch(url, tuple(expected_variants), real_status)
+                for url, expected_variants, real_status
+                in json.loads(shard_mismatches)
+            )
+            total += shard_total
+        return dict(status_counter), inappropriate_statuses, total
+
+    @contextmanager
+    def transaction(self):
+        """Транзакция с блокировкой записи на всё время её выполнения."""
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+
+
+def process_shard(session, pep_refs):
+    """Загружает статусы PEP шарда и подсчитывает частичный результат."""
+    pep_statuses = []
+    for pep_ref in pep_refs:
+        try:
+            pep_status = utils.fetch_pep_status(session, pep_ref)
+        except Exception as error:
+            logging.error(
+                f'Пропущена строка PEP {pep_ref.number} ({pep_ref.url}): '
+                f'{error}'
+            )
+            continue
+        if pep_status is not None:
+            pep_statuses.append(pep_status)
+    return utils.aggregate_pep_statuses(pep_statuses)
+
+
+def run_worker(session, queue_path=None):
+    """Обрабатывает шарды из очереди, пока свободные шарды не закончатся.
+
+    Возвращает число обработанных этим обработчиком шардов.
+    """
+    worker = f'{os.uname().nodename}:{os.getpid()}'
+    processed = constants.ZERO_INT
+    with ShardQueue(queue_path) as queue:
+        while True:
+            claimed = queue.claim(worker)
+            if claimed is None:
+                return processed
+            shard_id, pep_refs = claimed
+            queue.complete(shard_id, *process_shard(session, pep_refs))
+            processed += constants.ONE_INT
+            logging.info(
+                f'Обработчик {worker}: шард {shard_id} обработан '
+                f'({len(pep_refs)} PEP)'
+            )
+
+
+def worker_process(session_factory, queue_path, log_queue):
+    """Точка входа процесса-обработчика со своей HTTP-сессией."""
+    configure_worker_logging(log_queue)
+    session = session_factory()
+    try:
+        run_worker(session, queue_path)
+    finally:
+        session.close()
+
+
+def run_workers(session_factory, queue_path=None,
+                workers=constants.SHARD_WORKERS):
+    """Запускает workers локальных процессов и ждёт их завершения.
+
+    session_factory вызывается в каждом процессе и должна создавать
+    отдельную HTTP-сессию: сокеты сессии нельзя разделять между процессами.
+    Процессы запускаются через spawn, поэтому session_factory должна
+    сериализоваться pickle. Логи процессов передаются через очередь и
+    пишутся основным процессом.
+    """
+    context = multiprocessing.get_context(constants.SHARD_START_METHOD)
+    log_queue = context.Queue()
+    log_listener = start_worker_logging(log_queue)
+    processes = [
+        context.Process(
+            target=worker_process,
+            args=(session_factory, queue_path, log_queue)
+        )
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                logging.error(
+                    f'Процесс-обработчик {process.pid} завершился с кодом '
+                    f'{process.exitcode}'
+                )
+    finally:
+        log_listener.stop()
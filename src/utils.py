@@ -1,42 +1,222 @@
+import json
 import logging
+import os
 import re
-from urllib.parse import urljoin
-
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import requests
 import requests_cache
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 from urllib3.util.retry import Retry
 
-from src.constants import (BACKOFF_FACTOR, DEFAULT_INT, EXPECTED_STATUS,
-                           FIVE_INT, FOUR_INT, MAIN_PEP_URL, ONE_INT,
-                           STATUS_FORCE_LIST, TOTAL_RETRIES,
-                           VERSION_PYTHON_STATUS_PATTERN, ZERO_INT)
+from src.configs import DEFAULT_SETTINGS
+from src.constants import (CANONICAL_HOSTS, DEFAULT_PORTS, DOWNLOAD_CHUNK_SIZE,
+                           DOWNLOADS_STATUS_TO_DOCS, EXPECTED_STATUS,
+                           EXPECTED_STATUS_PAIRS, FOUR_INT,
+                           LATEST_VERSIONS_CACHE_PATH, LATEST_VERSIONS_TTL,
+                           MAX_WORKERS, ONE_INT, PARSER_ENGINE,
+                           PEP_NUMERICAL_URL, PREFETCH_DEPTH,
+                           PYTHON_DOWNLOADS_URL, VERSION_PYTHON_STATUS_PATTERN,
+                           ZERO_INT)
 from src.exceptions import NetworkError, ParserFindTagException
+from src.records import (PepError, PepRef, PepStatus, StatusMismatch,
+                         VersionEntry, WhatsNewEntry)
+
+VERSION_STATUS_RE = re.compile(VERSION_PYTHON_STATUS_PATTERN)
+ALL_VERSIONS_RE = re.compile('All versions')
 
 
 # --------------------
 # Работа с HTTP сессией и запросами
 # --------------------
 
-def create_session_with_retries():
-    """Создает сессию requests с ретраями и кэшированием."""
-    session = requests_cache.CachedSession()
+def canonicalize_url(url):
+    """Приводит URL документа к единой форме.
+
+    Отбрасывает фрагмент, порт по умолчанию и 'index.html', приводит имя
+    хоста к нижнему регистру. Для сайтов документации Python дополнительно
+    переходит на https и добавляет завершающий слэш к адресам разделов.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+    host = parts.hostname.lower()
+    scheme = parts.scheme
+    path = parts.path or '/'
+    if path.endswith('/index.html'):
+        path = path[:-len('index.html')]
+    if host in CANONICAL_HOSTS:
+        scheme = 'https'
+        if '.' not in path.rsplit('/', 1)[-1] and not path.endswith('/'):
+            path += '/'
+    port = parts.port
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+    return urlunsplit((scheme, host, path, parts.query, ''))
+
+
+class RequestCoalescer:
+    """Объединяет повторные запросы одного документа в рамках сессии.
+
+    Запросы к одному канонизированному URL, пришедшие, пока первый ещё
+    выполняется, ждут его ответ вместо отдельной загрузки. Счётчики
+    показывают, сколько обращений удалось сэкономить.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.seen = set()
+        self.stats = Counter()
+
+    def fetch(self, url, get):
+        """Возвращает ответ по URL, загружая его функцией get не чаще раза."""
+        canonical_url = canonicalize_url(url)
+        with self.lock:
+            self.stats['requests'] += ONE_INT
+            if canonical_url != url:
+                self.stats['normalized'] += ONE_INT
+            future = self.in_flight.get(canonical_url)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self.in_flight[canonical_url] = future
+                if canonical_url in self.seen:
+                    self.stats['repeated'] += ONE_INT
+                else:
+                    self.stats['unique'] += ONE_INT
+                    self.seen.add(canonical_url)
+            else:
+                self.stats['coalesced'] += ONE_INT
+
+        if not is_owner:
+            return future.result()
+        try:
+            response = get(canonical_url)
+            future.set_result(response)
+            return response
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[canonical_url]
+
+    def snapshot(self):
+        """Возвращает копию счётчиков."""
+        with self.lock:
+            return Counter(self.stats)
+
+
+def log_dedup_summary(stats):
+    """Логирует итоги дедупликации запросов за запуск."""
+    logging.info(
+        f'Запросов: {stats["requests"]}, уникальных документов: '
+        f'{stats["unique"]}, объединено одновременных: '
+        f'{stats["coalesced"]}, повторных (из кэша): {stats["repeated"]}, '
+        f'нормализовано URL: {stats["normalized"]}'
+    )
+
+
+class RateLimiter:
+    """Ограничивает частоту запросов: не больше rate запросов в секунду."""
+
+    def __init__(self, rate):
+        self.interval = ONE_INT / rate if rate > ZERO_INT else ZERO_INT
+        self.lock = threading.Lock()
+        self.next_time = time.monotonic()
+
+    def wait(self):
+        """Ждёт, пока очередной запрос не нарушит ограничение."""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > ZERO_INT:
+            time.sleep(delay)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP-адаптер с ограничением частоты запросов.
+
+    Ответы из кэша requests_cache до адаптера не доходят, поэтому
+    ограничение касается только реальных обращений к сети.
+    """
+
+    def __init__(self, rate_limiter, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+
+    def send(self, request, **kwargs):
+        self.rate_limiter.wait()
+        return super().send(request, **kwargs)
+
+
+def get_settings(session):
+    """Возвращает настройки, с которыми создана сессия."""
+    return getattr(session, 'parser_settings', DEFAULT_SETTINGS)
+
+
+def mount_retry_adapter(session, settings, rate_limit):
+    """Подключает к сессии адаптер с ретраями и ограничением частоты."""
     retries = Retry(
-        total=TOTAL_RETRIES,
-        backoff_factor=BACKOFF_FACTOR,
-        status_forcelist=STATUS_FORCE_LIST
+        total=settings.total_retries,
+        backoff_factor=settings.backoff_factor,
+        status_forcelist=settings.status_forcelist
     )
-    adapter = HTTPAdapter(max_retries=retries)
+    adapter = RateLimitedAdapter(RateLimiter(rate_limit), max_retries=retries)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
+
+
+def create_session_with_retries(settings=DEFAULT_SETTINGS):
+    """Создает сессию requests с ретраями и кэшированием."""
+    session = requests_cache.CachedSession(backend=settings.cache_backend)
+    session.parser_settings = settings
+    session.coalescer = RequestCoalescer()
+    mount_retry_adapter(session, settings, settings.rate_limit)
+    return session
+
+
+def create_uncached_session(settings=DEFAULT_SETTINGS, rate_limit=None):
+    """Создает сессию requests с ретраями, но без HTTP-кэша.
+
+    Нужна для запросов, ответы на которые не должны читаться из кэша и
+    попадать в него. Своя сессия не мешает другим потокам, работающим
+    с общей кэширующей сессией. rate_limit заменяет rate_limit настроек.
+    """
+    session = requests.Session()
+    session.parser_settings = settings
+    mount_retry_adapter(
+        session, settings,
+        settings.rate_limit if rate_limit is None else rate_limit
+    )
     return session
 
 
 def get_response(session, url, encoding='utf-8'):
     """Отправить GET-запрос и вернуть Response."""
+    coalescer = getattr(session, 'coalescer', None)
+    timeout = get_settings(session).timeout
     try:
-        response = session.get(url, timeout=FIVE_INT)
+        if coalescer is None:
+            response = session.get(canonicalize_url(url), timeout=timeout)
+        else:
+            response = coalescer.fetch(
+                url, lambda canonical_url: session.get(
+                    canonical_url, timeout=timeout)
+            )
         response.encoding = encoding
         response.raise_for_status()
         return response
@@ -44,11 +224,21 @@ def get_response(session, url, encoding='utf-8'):
         raise NetworkError(f'Ошибка при запросе к {url}: {e}')
 
 
+@contextmanager
+def worker_pool(executor=None, max_workers=MAX_WORKERS):
+    """Возвращает переданный пул потоков или создаёт временный."""
+    if executor is not None:
+        yield executor
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as own_executor:
+        yield own_executor
+
+
 # --------------------
 # Работа с BeautifulSoup: получение и поиск тегов
 # --------------------
 
-def get_soup(response, parser='lxml'):
+def get_soup(response, parser=PARSER_ENGINE):
     """Возвращает объект BeautifulSoup из ответа."""
     return BeautifulSoup(response.text, parser)
 
@@ -57,7 +247,30 @@ def fetch_and_parse(session, base_url, relative_path=''):
     """Получить и распарсить страницу по URL."""
     url = urljoin(base_url, relative_path)
     response = get_response(session, url)
-    return get_soup(response)
+    return get_soup(response, get_settings(session).parser_engine)
+
+
+@contextmanager
+def parsed_page(session, base_url, relative_path=''):
+    """Загружает страницу и разрушает её дерево при выходе из блока.
+
+    Деревья BeautifulSoup содержат циклические ссылки и без явного
+    decompose() живут до ближайшей полной сборки мусора.
+    """
+    soup = fetch_and_parse(session, base_url, relative_path)
+    try:
+        yield soup
+    finally:
+        release_soup(soup)
+
+
+def release_soup(soup):
+    """Разрушает дерево BeautifulSoup, разрывая циклические ссылки."""
+    # Корень дерева не связан с потомками через next_element, поэтому
+    # decompose() у самого BeautifulSoup не обходит документ целиком.
+    for element in list(soup.contents):
+        element.decompose()
+    soup.decompose()
 
 
 def find_tag(soup, tag, attrs=None):
@@ -76,7 +289,7 @@ def find_tag(soup, tag, attrs=None):
 
 def get_pep_rows(session):
     """Получает строки таблицы PEP и базовый URL страницы."""
-    numerical_url = urljoin(MAIN_PEP_URL, 'numerical')
+    numerical_url = PEP_NUMERICAL_URL
     soup = fetch_and_parse(session, numerical_url)
     table = find_tag(soup, 'table')
     rows = table.find_all('tr')
@@ -89,82 +302,184 @@ def extract_status_from_dl(dl_tag):
     dd_tags = dl_tag.find_all('dd')
     for dt_tag, dd_tag in zip(dt_tags, dd_tags):
         if dt_tag.text.strip() == 'Status:':
-            return dd_tag.text.strip()
+            return sys.intern(dd_tag.text.strip())
     return None
 
 
-def process_pep_row(session, row, base_url):
-    """Обрабатывает одну строку таблицы PEP и возвращает статус и URL."""
+def parse_pep_row(row, base_url):
+    """Извлекает из строки таблицы PEP номер, код статуса и URL."""
     columns = row.find_all('td')
 
     if len(columns) < FOUR_INT:
         return None
 
     code = columns[ZERO_INT].text.strip()
-    preview_status = code[ONE_INT:]
-    expected_variants = EXPECTED_STATUS.get(preview_status, ())
-
     pep_link_tag = find_tag(columns[ONE_INT], 'a')
-    if pep_link_tag is None:
+    return PepRef(
+        number=columns[ONE_INT].text.strip(),
+        preview_status=sys.intern(code[ONE_INT:]),
+        url=urljoin(base_url, pep_link_tag.get('href'))
+    )
+
+
+def fetch_pep_status(session, pep_ref):
+    """Загружает страницу PEP и возвращает её реальный статус."""
+    with parsed_page(session, pep_ref.url) as soup:
+        dl_tag = find_tag(soup, 'dl')
+        real_status = extract_status_from_dl(dl_tag)
+    if real_status is None:
+        logging.warning(f'Не найден статус на странице {pep_ref.url}')
         return None
 
-    href = pep_link_tag.get('href')
-    pep_url = urljoin(base_url, href)
+    return PepStatus(
+        number=pep_ref.number,
+        url=pep_ref.url,
+        real_status=real_status,
+        expected_variants=EXPECTED_STATUS.get(pep_ref.preview_status, ())
+    )
 
-    soup = fetch_and_parse(session, pep_url)
 
-    dl_tag = find_tag(soup, 'dl')
-    if dl_tag is None:
+def process_pep_row(session, row, base_url):
+    """Обрабатывает одну строку таблицы PEP и возвращает её статус."""
+    pep_ref = parse_pep_row(row, base_url)
+    if pep_ref is None:
         return None
+    return fetch_pep_status(session, pep_ref)
 
-    real_status = extract_status_from_dl(dl_tag)
-    if real_status is None:
-        logging.warning(f'Не найден статус на странице {pep_url}')
-        return None
 
-    return real_status, expected_variants, pep_url
+def load_pep_status(session, row, base_url, checkpoint=None):
+    """Разбирает строку таблицы PEP и получает статус PEP.
+
+    Статус берётся из точки сохранения, если он там есть, иначе
+    загружается страница PEP. Возвращает пару (статус, ошибка), одно из
+    значений которой равно None.
+    """
+    pep_ref = None
+    try:
+        pep_ref = parse_pep_row(row, base_url)
+        if pep_ref is None:
+            raise TypeError('Пустой результат обработки')
+        if checkpoint is not None and pep_ref.number in checkpoint:
+            return checkpoint.get(pep_ref.number), None
+
+        pep_status = fetch_pep_status(session, pep_ref)
+        if pep_status is None:
+            raise TypeError('Пустой результат обработки')
+        return pep_status, None
+
+    except TypeError:
+        return None, make_pep_error(
+            pep_ref, 'не удалось обработать строку или отсутствуют данные')
+    except Exception as e:
+        return None, make_pep_error(pep_ref, str(e))
+
 
+def prefetch(pool, function, items, depth=PREFETCH_DEPTH):
+    """Выполняет function для элементов items в пуле с опережением.
 
-def analyze_peps(session, pep_data):
-    """Анализирует строки PEP, подсчитывает статусы и собирает ошибки."""
+    В работе одновременно не больше depth элементов: следующий элемент
+    берётся из items, только когда потребитель забрал готовый результат,
+    поэтому память ограничена независимо от длины items. Результаты
+    выдаются в порядке items.
+    """
+    items = iter(items)
+    pending = deque(
+        pool.submit(function, item) for item in islice(items, depth))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(items, ONE_INT):
+                pending.append(pool.submit(function, item))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def analyze_peps(session, pep_data, checkpoint=None, executor=None):
+    """Анализирует строки PEP, подсчитывает статусы и собирает ошибки.
+
+    Строки таблицы разбираются, а страницы PEP загружаются в пуле потоков
+    с опережением на PREFETCH_DEPTH строк, пока основной поток забирает
+    готовые результаты по порядку. Статусы подсчитываются одним пакетом в
+    aggregate_pep_statuses. Если передан checkpoint, уже обработанные в
+    прошлом запуске PEP не загружаются повторно, а новые результаты
+    периодически сохраняются.
+    """
     pep_rows, numerical_url = pep_data
 
-    status_counter = {}
-    inappropriate_statuses = []
+    pep_statuses = []
     errors = []
-    total = ZERO_INT
 
-    for row in tqdm(pep_rows[ONE_INT:], desc='Обработка PEP'):
-        try:
-            result = process_pep_row(session, row, numerical_url)
-            if result is None:
-                raise TypeError('Пустой результат обработки')
-
-            real_status, expected_variants, pep_url = result
-
-            if expected_variants and real_status not in expected_variants:
-                inappropriate_statuses.append({
-                    'pep_url': pep_url,
-                    'expected_variants': expected_variants,
-                    'real_status': real_status
-                })
-
-            status_counter[real_status] = status_counter.get(
-                real_status, DEFAULT_INT) + ONE_INT
-            total += ONE_INT
-
-        except TypeError:
-            errors.append(
-                'Пропущена строка PEP:'
-                f'не удалось обработать строку или отсутствуют данные: {row}'
+    try:
+        with worker_pool(executor) as pool:
+            loaded = prefetch(
+                pool,
+                lambda row: load_pep_status(
+                    session, row, numerical_url, checkpoint),
+                pep_rows[ONE_INT:]
             )
-        except Exception as e:
-            errors.append(f'Ошибка при обработке строки PEP: {e}')
+            for pep_status, error in tqdm(
+                loaded,
+                total=max(len(pep_rows) - ONE_INT, ZERO_INT),
+                desc='Обработка PEP'
+            ):
+                if error is not None:
+                    errors.append(error)
+                    continue
+                pep_statuses.append(pep_status)
+                if (checkpoint is not None
+                        and pep_status.number not in checkpoint):
+                    checkpoint.add(pep_status)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
 
-    for err_msg in errors:
-        logging.error(err_msg)
+    for error in errors:
+        logging.error(
+            f'Пропущена строка PEP {error.number} ({error.url}): '
+            f'{error.reason}'
+        )
+
+    return aggregate_pep_statuses(pep_statuses)
 
-    return status_counter, inappropriate_statuses, total
+
+def aggregate_pep_statuses(pep_statuses):
+    """Подсчитывает статусы и несоответствия для набора статусов PEP.
+
+    Строки группируются по паре (ожидаемые статусы, реальный статус), и
+    каждая пара сверяется с таблицей EXPECTED_STATUS_PAIRS один раз, а не
+    для каждой строки.
+    """
+    pairs = Counter(
+        (pep_status.expected_variants, pep_status.real_status)
+        for pep_status in pep_statuses
+    )
+    status_counter = Counter()
+    for (_, real_status), count in pairs.items():
+        status_counter[real_status] += count
+    mismatched_pairs = {
+        pair for pair in pairs
+        if pair[ZERO_INT] and pair not in EXPECTED_STATUS_PAIRS
+    }
+    inappropriate_statuses = [
+        StatusMismatch(
+            pep_url=pep_status.url,
+            expected_variants=pep_status.expected_variants,
+            real_status=pep_status.real_status
+        )
+        for pep_status in pep_statuses
+        if (pep_status.expected_variants, pep_status.real_status)
+        in mismatched_pairs
+    ] if mismatched_pairs else []
+    return dict(status_counter), inappropriate_statuses, len(pep_statuses)
+
+
+def make_pep_error(pep_ref, reason):
+    """Создаёт запись об ошибке без ссылок на теги разобранной страницы."""
+    if pep_ref is None:
+        return PepError(number='?', url='?', reason=reason)
+    return PepError(number=pep_ref.number, url=pep_ref.url, reason=reason)
 
 
 def log_inappropriate_statuses(inappropriate_statuses):
@@ -172,9 +487,9 @@ def log_inappropriate_statuses(inappropriate_statuses):
     messages = []
     for item in inappropriate_statuses:
         msg = (
-            f'Несовпадение статуса PEP {item["pep_url"]}\n'
-            f'\tОжидался один из: {item["expected_variants"]}\n'
-            f'\tПолучен: {repr(item["real_status"])}\n'
+            f'Несовпадение статуса PEP {item.pep_url}\n'
+            f'\tОжидался один из: {item.expected_variants}\n'
+            f'\tПолучен: {repr(item.real_status)}\n'
         )
         logging.warning(msg)
         messages.append(msg)
@@ -187,13 +502,13 @@ def log_inappropriate_statuses(inappropriate_statuses):
 
 def parse_python_version_page(session, url):
     """Парсит страницу нововведений конкретной версии Python."""
-    soup = fetch_and_parse(session, url)
-
-    h1 = find_tag(soup, 'h1')
-    dl = find_tag(soup, 'dl')
-    dl_text = dl.text.replace('\n', ' ')
+    with parsed_page(session, url) as soup:
+        h1 = find_tag(soup, 'h1')
+        dl = find_tag(soup, 'dl')
+        dl_text = dl.text.replace('\n', ' ')
+        h1_text = h1.text if h1 else ''
 
-    return (url, h1.text if h1 else '', dl_text)
+    return WhatsNewEntry(url, h1_text, dl_text)
 
 
 def get_sidebar_ul_tags(soup):
@@ -210,35 +525,73 @@ def get_python_new_features_sections(soup):
     return sections_by_python
 
 
-def parse_versions_list(ul_tag, pattern=VERSION_PYTHON_STATUS_PATTERN):
+def get_all_versions_ul(soup):
+    """Возвращает <ul> сайдбара со ссылкой 'All versions'."""
+    sidebar = find_tag(soup, 'div', {'class': 'sphinxsidebarwrapper'})
+    all_versions_tag = sidebar.find(string=ALL_VERSIONS_RE)
+    if all_versions_tag is None:
+        return None
+    return all_versions_tag.find_parent('ul')
+
+
+def parse_versions_list(ul_tag, pattern=VERSION_STATUS_RE):
     """Парсит список версий из <ul> по заданному паттерну."""
+    pattern = re.compile(pattern)
     results = []
     for a_tag in ul_tag.find_all('a'):
         link = a_tag.get('href')
-        text_match = re.search(pattern, a_tag.text)
+        text_match = pattern.search(a_tag.text)
         if text_match:
             version, status = text_match.groups()
         else:
             version, status = a_tag.text.strip(), ''
-        results.append((link, version, status))
+        results.append(VersionEntry(link, version, sys.intern(status)))
     return results
 
 
-def parse_whats_new_sections(session, sections, base_url):
-    """Парсит и возвращает данные по разделам 'Что нового'."""
-    results = []
-    errors = []
-
-    for section in tqdm(sections, desc='Парсинг секций "What\'s New"'):
+def parse_whats_new_section(session, section, base_url):
+    """Парсит одну секцию 'Что нового' и возвращает пару (данные, ошибка)."""
+    version_link = base_url
+    try:
         version_a_tag = find_tag(section, 'a')
-        href = version_a_tag.get('href')
-        version_link = urljoin(base_url, href)
+        version_link = urljoin(base_url, version_a_tag.get('href'))
+        return parse_python_version_page(session, version_link), None
+    except (NetworkError, ParserFindTagException) as e:
+        return None, f'Ошибка при обработке {version_link}: {e}'
+
 
+def fetch_responses(session, urls, executor=None):
+    """Параллельно загружает страницы, возвращая (url, ответ, ошибка)."""
+    def fetch(url):
         try:
-            parsed_data = parse_python_version_page(session, version_link)
-            results.append(parsed_data)
-        except ConnectionError as e:
-            errors.append(f'Ошибка при обработке {version_link}: {e}')
+            return url, get_response(session, url), None
+        except NetworkError as e:
+            return url, None, e
+
+    with worker_pool(executor) as pool:
+        yield from pool.map(fetch, urls)
+
+
+def parse_whats_new_sections(session, sections, base_url, executor=None):
+    """Параллельно парсит разделы 'Что нового' в порядке оглавления."""
+    results = []
+    errors = []
+
+    with worker_pool(executor) as pool:
+        parsed_sections = pool.map(
+            lambda section: parse_whats_new_section(
+                session, section, base_url),
+            sections
+        )
+        for parsed_data, error in tqdm(
+            parsed_sections,
+            total=len(sections),
+            desc='Парсинг секций "What\'s New"'
+        ):
+            if error is None:
+                results.append(parsed_data)
+            else:
+                errors.append(error)
 
     for error in errors:
         logging.error(error)
@@ -246,6 +599,81 @@ def parse_whats_new_sections(session, sections, base_url):
     return results
 
 
+# --------------------
+# Кэш и сверка списка версий Python
+# --------------------
+
+def load_cached_versions(path=None, ttl=LATEST_VERSIONS_TTL):
+    """Возвращает сохранённый список версий, если он ещё не устарел.
+
+    Отсутствующий, устаревший или повреждённый файл считается промахом.
+    """
+    path = path or LATEST_VERSIONS_CACHE_PATH
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+        if time.time() - cached['fetched_at'] > ttl:
+            return None
+        return [
+            VersionEntry(link, version, sys.intern(status))
+            for link, version, status in cached['entries']
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached_versions(entries, path=None):
+    """Сохраняет список версий вместе со временем получения."""
+    path = path or LATEST_VERSIONS_CACHE_PATH
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'fetched_at': time.time(), 'entries': entries}, f)
+    os.replace(tmp_path, path)
+
+
+def clear_cached_versions(path=None):
+    """Удаляет сохранённый список версий."""
+    path = path or LATEST_VERSIONS_CACHE_PATH
+    if path.exists():
+        path.unlink()
+
+
+def get_download_release_statuses(session):
+    """Возвращает статусы поддерживаемых версий со страницы загрузок."""
+    with parsed_page(session, PYTHON_DOWNLOADS_URL) as soup:
+        widget = find_tag(
+            soup, 'div', {'class': 'active-release-list-widget'})
+        return {
+            version_tag.text.strip(): status_tag.text.strip()
+            for version_tag, status_tag in zip(
+                widget.find_all(class_='release-version'),
+                widget.find_all(class_='release-status')
+            )
+        }
+
+
+def check_versions_against_downloads(session, entries):
+    """Сверяет статусы версий документации со страницей загрузок."""
+    docs_statuses = {entry.version: entry.status for entry in entries}
+    messages = []
+    for version, status in get_download_release_statuses(session).items():
+        expected = DOWNLOADS_STATUS_TO_DOCS.get(status, status)
+        if version not in docs_statuses:
+            messages.append(
+                f'Версия {version} ({status}) есть на странице загрузок, '
+                'но отсутствует в документации'
+            )
+        elif docs_statuses[version] != expected:
+            messages.append(
+                f'Статус версии {version}: в документации '
+                f'{docs_statuses[version]!r}, на странице загрузок '
+                f'{status!r}'
+            )
+    for msg in messages:
+        logging.warning(msg)
+    return messages
+
+
 # --------------------
 # Скачивание PDF архива документации
 # --------------------
@@ -253,23 +681,31 @@ def parse_whats_new_sections(session, sections, base_url):
 def download_pdf_archive(session, base_url, save_dir):
     """Скачать PDF архив документации и сохранить его."""
     downloads_url = urljoin(base_url, 'download.html')
-    soup = fetch_and_parse(session, downloads_url)
-
-    table = find_tag(soup, 'table', {'class': 'docutils'})
-    pdf_link_tag = find_tag(
-        table, 'a', {'href': re.compile(r'.+pdf-a4\.zip$')})
-    pdf_link = pdf_link_tag.get('href')
+    with parsed_page(session, downloads_url) as soup:
+        table = find_tag(soup, 'table', {'class': 'docutils'})
+        pdf_link_tag = find_tag(
+            table, 'a', {'href': re.compile(r'.+pdf-a4\.zip$')})
+        pdf_link = pdf_link_tag.get('href')
 
     archive_url = urljoin(downloads_url, pdf_link)
 
     save_dir.mkdir(exist_ok=True, parents=True)
     archive_path = save_dir / archive_url.split('/')[-1]
 
-    file_response = session.get(archive_url)
-    file_response.raise_for_status()
-
-    with open(archive_path, 'wb') as f:
-        f.write(file_response.content)
+    # Кэширующая сессия читает тело ответа целиком даже при stream=True и
+    # сохраняет его в HTTP-кэш, поэтому архив загружается отдельной
+    # сессией без кэша.
+    settings = get_settings(session)
+    tmp_path = archive_path.with_name(archive_path.name + '.part')
+    with create_uncached_session(settings) as archive_session:
+        with archive_session.get(
+            archive_url, stream=True, timeout=settings.timeout
+        ) as file_response:
+            file_response.raise_for_status()
+            with open(tmp_path, 'wb') as f:
+                for chunk in file_response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+    os.replace(tmp_path, archive_path)
 
     logging.info(f'Архив успешно загружен и сохранён: {archive_path}')
     return archive_path
@@ -0,0 +1,125 @@
+import logging
+from collections import Counter
+from urllib.parse import urljoin
+
+import requests_cache
+from tqdm import tqdm
+
+from src import constants, utils
+from src.exceptions import NetworkError, ParserFindTagException
+from src.records import WarmupStats
+
+
+def pep_page_urls(soup, base_url):
+    """Адреса страниц PEP из таблицы numerical."""
+    urls = []
+    for row in utils.find_tag(soup, 'table').find_all('tr'):
+        try:
+            pep_ref = utils.parse_pep_row(row, base_url)
+        except ParserFindTagException:
+            continue
+        if pep_ref is not None:
+            urls.append(pep_ref.url)
+    return urls
+
+
+def whats_new_page_urls(soup, base_url):
+    """Адреса страниц 'Что нового' отдельных версий Python."""
+    return [
+        urljoin(base_url, utils.find_tag(section, 'a').get('href'))
+        for section in utils.get_python_new_features_sections(soup)
+    ]
+
+
+# Для каждого режима: адрес стартовой страницы и функция, извлекающая из
+# неё адреса остальных нужных режиму страниц.
+WARMUP_PAGES = {
+    'pep': (constants.PEP_NUMERICAL_URL, pep_page_urls),
+    'whats-new': (
+        urljoin(constants.MAIN_DOC_URL, constants.WHATS_NEW_SLUG),
+        whats_new_page_urls
+    ),
+    'latest-versions': (constants.MAIN_DOC_URL, None),
+}
+
+
+def count_response(stats, response, error):
+    """Учитывает ответ: взят ли он из кэша или загружен заново."""
+    if error is not None:
+        stats['errors'] += constants.ONE_INT
+    elif getattr(response, 'from_cache', False):
+        stats['fresh'] += constants.ONE_INT
+    else:
+        stats['fetched'] += constants.ONE_INT
+
+
+def warm_mode(session, mode, executor=None):
+    """Загружает в кэш все страницы, которые нужны режиму."""
+    index_url, extract_urls = WARMUP_PAGES[mode]
+    stats = Counter()
+    try:
+        response = utils.get_response(session, index_url)
+    except NetworkError as error:
+        logging.error(f'Не удалось прогреть кэш режима {mode}: {error}')
+        return WarmupStats(mode, constants.ONE_INT, constants.ZERO_INT,
+                           constants.ZERO_INT, constants.ONE_INT)
+    count_response(stats, response, None)
+
+    urls = []
+    if extract_urls is not None:
+        soup = utils.get_soup(
+            response, utils.get_settings(session).parser_engine)
+        try:
+            urls = extract_urls(soup, index_url)
+        except ParserFindTagException as error:
+            logging.error(f'Не удалось разобрать {index_url}: {error}')
+            stats['errors'] += constants.ONE_INT
+        finally:
+            utils.release_soup(soup)
+
+    for url, response, error in tqdm(
+        utils.fetch_responses(session, urls, executor),
+        total=len(urls),
+        desc=f'Прогрев кэша {mode}'
+    ):
+        if error is not None:
+            logging.error(f'Не удалось загрузить {url}: {error}')
+        count_response(stats, response, error)
+
+    return WarmupStats(
+        mode=mode,
+        urls=len(urls) + constants.ONE_INT,
+        fresh=stats['fresh'],
+        fetched=stats['fetched'],
+        errors=stats['errors']
+    )
+
+
+def import_cache_bundle(session, path):
+    """Добавляет в кэш сессии записи из ранее выгруженного файла.
+
+    Возвращает число записей в файле.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f'Файл выгрузки кэша не найден: {path}')
+    bundle = requests_cache.SQLiteCache(path)
+    try:
+        session.cache.update(bundle)
+        return len(bundle.responses)
+    finally:
+        bundle.close()
+
+
+def export_cache_bundle(session, path):
+    """Выгружает кэш сессии в отдельный файл SQLite.
+
+    Возвращает число выгруженных записей.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    bundle = requests_cache.SQLiteCache(path)
+    try:
+        bundle.clear()
+        bundle.update(session.cache)
+        return len(bundle.responses)
+    finally:
+        bundle.close()
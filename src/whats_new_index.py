@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+from urllib.parse import urljoin
+
+from tqdm import tqdm
+
+from src import constants, utils
+from src.exceptions import ParserFindTagException
+
+# Номер версии схемы индекса. Индекс с другой версией пересоздаётся:
+# его можно восстановить повторной индексацией.
+SCHEMA_VERSION = 2
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+    version,
+    heading,
+    body,
+    url UNINDEXED,
+    page_url UNINDEXED,
+    tokenize = 'unicode61'
+);
+'''
+VERSION_RE = re.compile(r'(\d+\.\d+)')
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+
+def open_index(path=None):
+    """Открывает (и при необходимости создаёт) полнотекстовый индекс."""
+    path = path or constants.WHATS_NEW_INDEX_PATH
+    connection = sqlite3.connect(path)
+    version, = connection.execute('PRAGMA user_version').fetchone()
+    if version != SCHEMA_VERSION:
+        connection.executescript(
+            'DROP TABLE IF EXISTS pages; DROP TABLE IF EXISTS entries;')
+        connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def get_page_version(url):
+    """Возвращает номер версии Python по адресу страницы 'Что нового'."""
+    version_match = VERSION_RE.search(url.rsplit('/', 1)[-1])
+    return version_match.group(1) if version_match else ''
+
+
+def extract_page_entries(soup, url):
+    """Возвращает (заголовок, текст, ссылка) для каждого раздела страницы."""
+    entries = []
+    for section in soup.find_all('section'):
+        heading = section.find(HEADING_TAGS)
+        if heading is None or heading.find_parent('section') is not section:
+            continue
+        paragraphs = [
+            paragraph.get_text(' ', strip=True)
+            for paragraph in section.find_all('p')
+            if paragraph.find_parent('section') is section
+        ]
+        anchor = section.get('id')
+        entries.append((
+            heading.get_text(' ', strip=True).rstrip('¶').strip(),
+            '\n'.join(paragraphs),
+            f'{url}#{anchor}' if anchor else url,
+        ))
+    return entries
+
+
+def parse_page_entries(response, url, parser=constants.PARSER_ENGINE):
+    """Разбирает страницу и возвращает её разделы."""
+    soup = utils.get_soup(response, parser)
+    try:
+        return extract_page_entries(soup, url)
+    finally:
+        utils.release_soup(soup)
+
+
+def get_entries_digest(entries):
+    """Подпись разделов страницы для проверки, изменилась ли она.
+
+    Считается по извлечённым заголовкам и тексту, а не по HTML: правки
+    оформления страницы (подвал, дата сборки) не вызывают переиндексации.
+    """
+    return hashlib.sha256(
+        json.dumps(entries, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def index_page(connection, url, entries, digest):
+    """Переиндексирует одну страницу, заменяя её прежние записи."""
+    version = get_page_version(url)
+    with connection:
+        connection.execute('DELETE FROM entries WHERE page_url = ?', (url,))
+        connection.executemany(
+            'INSERT INTO entries (version, heading, body, url, page_url) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [(version, heading, body, link, url)
+             for heading, body, link in entries]
+        )
+        connection.execute(
+            'INSERT OR REPLACE INTO pages (url, version, digest) '
+            'VALUES (?, ?, ?)',
+            (url, version, digest)
+        )
+
+
+def remove_stale_pages(connection, urls):
+    """Удаляет из индекса страницы, которых больше нет в оглавлении."""
+    stale = [
+        (url,) for url, in connection.execute('SELECT url FROM pages')
+        if url not in urls
+    ]
+    with connection:
+        connection.executemany(
+            'DELETE FROM entries WHERE page_url = ?', stale)
+        connection.executemany('DELETE FROM pages WHERE url = ?', stale)
+    return len(stale)
+
+
+def get_version_links(sections, base_url):
+    """Адреса страниц версий из оглавления, без повреждённых пунктов."""
+    links = []
+    for section in sections:
+        try:
+            links.append(
+                urljoin(base_url, utils.find_tag(section, 'a').get('href')))
+        except ParserFindTagException as error:
+            logging.error(f'Пропущен пункт оглавления: {error}')
+    return links
+
+
+def build_index(session, connection, sections, base_url, executor=None):
+    """Инкрементально индексирует страницы, перестраивая только изменённые.
+
+    Возвращает число переиндексированных, неизменившихся и удалённых из
+    индекса страниц.
+    """
+    version_links = get_version_links(sections, base_url)
+    known_digests = dict(connection.execute('SELECT url, digest FROM pages'))
+    parser = utils.get_settings(session).parser_engine
+    indexed = skipped = constants.ZERO_INT
+
+    for url, response, error in tqdm(
+        utils.fetch_responses(session, version_links, executor),
+        total=len(version_links),
+        desc='Индексация "What\'s New"'
+    ):
+        if error is not None:
+            logging.error(f'Ошибка при индексации {url}: {error}')
+            continue
+        entries = parse_page_entries(response, url, parser)
+        digest = get_entries_digest(entries)
+        if known_digests.get(url) == digest:
+            skipped += constants.ONE_INT
+            continue
+        index_page(connection, url, entries, digest)
+        indexed += constants.ONE_INT
+
+    removed = (
+        remove_stale_pages(connection, set(version_links))
+        if version_links else constants.ZERO_INT
+    )
+    return indexed, skipped, removed
+
+
+def quote_query(query):
+    """Превращает запрос в выражение FTS5 из слов в кавычках.
+
+    Так точки, дефисы и апострофы в запросе (asyncio.run, f-strings,
+    what's) не разбираются как синтаксис FTS5. Находятся разделы, в
+    которых есть все слова запроса.
+    """
+    return ' '.join(
+        '"' + token.replace('"', '""') + '"' for token in query.split()
+    )
+
+
+def search_index(connection, query, limit=constants.SEARCH_RESULTS_LIMIT):
+    """Ищет разделы 'Что нового' по запросу, лучшие совпадения первыми."""
+    query = quote_query(query)
+    if not query:
+        return []
+    return connection.execute(
+        'SELECT version, heading, url, '
+        "snippet(entries, 2, '[', ']', '…', 12) "
+        'FROM entries WHERE entries MATCH ? ORDER BY rank LIMIT ?',
+        (query, limit)
+    ).fetchall()
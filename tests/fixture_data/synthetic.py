@@ -0,0 +1,172 @@
+"""Генератор синтетических страниц PEP и списков версий любого размера."""
+import random
+import re
+from collections import Counter, namedtuple
+
+from bs4 import BeautifulSoup
+
+from src.constants import EXPECTED_STATUS
+
+PEP_BASE_URL = 'https://peps.python.org/'
+NUMERICAL_URL = PEP_BASE_URL + 'numerical/'
+PEP_URL_RE = re.compile(r'https://peps\.python\.org/pep-(\d+)/')
+
+# Виды повреждённых данных, которые встречаются на реальных страницах.
+MISSING_LINK = 'missing_link'      # в строке таблицы нет ссылки на PEP
+SHORT_ROW = 'short_row'            # в строке таблицы меньше колонок
+MISSING_STATUS = 'missing_status'  # на странице PEP нет поля Status
+MISSING_DL = 'missing_dl'          # на странице PEP нет тега <dl>
+SERVER_ERROR = 'server_error'      # страница PEP отвечает ошибкой 500
+MISMATCH = 'mismatch'              # статус на странице не совпадает с кодом
+MALFORMATIONS = (
+    MISSING_LINK, SHORT_ROW, MISSING_STATUS, MISSING_DL, SERVER_ERROR,
+    MISMATCH,
+)
+
+SyntheticPep = namedtuple(
+    'SyntheticPep', ('number', 'code', 'real_status', 'malformation')
+)
+
+
+class SyntheticPeps:
+    """Таблица numerical и страницы PEP заданного размера.
+
+    rates задаёт долю строк с каждым видом повреждения. Генерация
+    детерминирована для одного seed, а ожидаемые результаты разбора
+    вычисляются по сгенерированным данным.
+    """
+
+    def __init__(self, count, rates=None, seed=0, padding=0):
+        self.padding = padding
+        rng = random.Random(seed)
+        rates = rates or {}
+        codes = list(EXPECTED_STATUS)
+        self.peps = []
+        for number in range(1, count + 1):
+            code = rng.choice(codes)
+            malformation = None
+            roll = rng.random()
+            for name in MALFORMATIONS:
+                roll -= rates.get(name, 0)
+                if roll < 0:
+                    malformation = name
+                    break
+            real_status = rng.choice(EXPECTED_STATUS[code])
+            if malformation == MISMATCH:
+                real_status = 'Unknown'
+            self.peps.append(
+                SyntheticPep(number, code, real_status, malformation))
+        self.by_number = {pep.number: pep for pep in self.peps}
+
+    def numerical_html(self):
+        """HTML страницы numerical со строкой заголовка и строками PEP."""
+        return (
+            '<html><body><table><tr><th>Status</th><th>PEP</th>'
+            '<th>Title</th><th>Authors</th></tr>'
+            + ''.join(map(self.row_html, self.peps))
+            + '</table></body></html>'
+        )
+
+    def row_html(self, pep):
+        if pep.malformation == SHORT_ROW:
+            return f'<tr><td>S{pep.code}</td><td>{pep.number}</td></tr>'
+        link = (
+            str(pep.number) if pep.malformation == MISSING_LINK
+            else f'<a href="../pep-{pep.number:04d}/">{pep.number}</a>'
+        )
+        return (
+            f'<tr><td>S{pep.code}</td><td>{link}</td>'
+            f'<td>Title {pep.number}</td><td>Author</td></tr>'
+        )
+
+    def pep_rows(self):
+        """Строки таблицы в том виде, в каком их возвращает get_pep_rows."""
+        soup = BeautifulSoup(self.numerical_html(), 'lxml')
+        return soup.find('table').find_all('tr'), NUMERICAL_URL
+
+    def pep_page(self, number):
+        """HTML страницы PEP с номером number."""
+        pep = self.by_number[number]
+        fields = (
+            '<dt>Author:</dt><dd>Author</dd>'
+            '<dt>Type:</dt><dd>Standards Track</dd>'
+        )
+        if pep.malformation != MISSING_STATUS:
+            fields += (
+                f'<dt>Status:</dt><dd><abbr>{pep.real_status}</abbr></dd>'
+            )
+        body = (
+            '' if pep.malformation == MISSING_DL else f'<dl>{fields}</dl>'
+        )
+        return (
+            f'<html><body><section><h1>PEP {number}</h1>{body}'
+            + '<p>Lorem ipsum <a href="#">dolor</a> sit amet.</p>'
+            * self.padding
+            + '</section></body></html>'
+        )
+
+    def register(self, adapter):
+        """Регистрирует страницы в адаптере requests_mock.
+
+        Страницы PEP формируются при запросе, поэтому регистрация не
+        зависит от числа PEP.
+        """
+        adapter.register_uri('GET', NUMERICAL_URL, text=self.numerical_html())
+        adapter.register_uri('GET', PEP_URL_RE, text=self.pep_response)
+
+    def pep_response(self, request, context):
+        pep = self.by_number.get(int(PEP_URL_RE.match(request.url).group(1)))
+        if pep is None or pep.malformation == SERVER_ERROR:
+            context.status_code = 500
+            return 'Internal Server Error'
+        return self.pep_page(pep.number)
+
+    def pep_urls(self):
+        """Адреса страниц PEP, на которые ссылается таблица numerical."""
+        return [
+            f'{PEP_BASE_URL}pep-{pep.number:04d}/' for pep in self.peps
+            if pep.malformation not in (SHORT_ROW, MISSING_LINK)
+        ]
+
+    def processed(self):
+        """PEP, которые должны попасть в результат без ошибок."""
+        return [
+            pep for pep in self.peps if pep.malformation in (None, MISMATCH)
+        ]
+
+    def expected_counter(self):
+        """Ожидаемое число PEP по статусам."""
+        return Counter(pep.real_status for pep in self.processed())
+
+    def expected_mismatches(self):
+        """Ожидаемые адреса PEP с несовпадающим статусом."""
+        return [
+            f'{PEP_BASE_URL}pep-{pep.number:04d}/'
+            for pep in self.processed() if pep.malformation == MISMATCH
+        ]
+
+
+def status_dl(fields_count, status='Final'):
+    """Тег <dl> с fields_count полями, последнее из которых — Status."""
+    return BeautifulSoup(
+        '<dl>'
+        + '<dt>Field:</dt><dd>Value</dd>' * (fields_count - 1)
+        + f'<dt>Status:</dt><dd>{status}</dd></dl>',
+        'lxml'
+    ).find('dl')
+
+
+def versions_ul(count, seed=0):
+    """Тег <ul> со списком из count версий Python и пунктом All versions."""
+    rng = random.Random(seed)
+    statuses = ('stable', 'security-fixes', 'EOL', 'in development')
+    items = [
+        f'<li><a href="https://docs.python.org/{major}.{minor}/">'
+        f'Python {major}.{minor} ({rng.choice(statuses)})</a></li>'
+        for major, minor in (divmod(index, 1000) for index in range(count))
+    ]
+    items.append(
+        '<li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li>'
+    )
+    return BeautifulSoup(f'<ul>{"".join(items)}</ul>', 'lxml').find('ul')
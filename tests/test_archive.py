@@ -0,0 +1,144 @@
+import os
+import zipfile
+
+import pytest
+import requests_mock
+from conftest import MAIN_DOC_URL
+from requests_cache import CachedSession
+
+try:
+    from src import archive, utils
+    from src.exceptions import ArchiveError
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archive.py`'
+
+FILES = {
+    'docs-pdf/library.pdf': b'%PDF library ' * 500,
+    'docs-pdf/howto-logging.pdf': b'%PDF logging ' * 500,
+    'docs-pdf/tutorial.pdf': b'%PDF tutorial ' * 500,
+}
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for name, content in FILES.items():
+            zip_file.writestr(name, content)
+    return path
+
+
+def test_manifest_lists_entries_and_is_reused(archive_path):
+    entries = archive.load_manifest(archive_path, verify=True)
+    assert sorted(entry.name for entry in entries) == sorted(FILES)
+    assert all(
+        entry.size == len(FILES[entry.name]) for entry in entries
+    ), 'Манифест должен содержать размеры файлов архива'
+    manifest_path = archive.get_manifest_path(archive_path)
+    assert manifest_path.exists(), 'Манифест сохраняется рядом с архивом'
+
+    mtime = manifest_path.stat().st_mtime_ns
+    assert archive.load_manifest(archive_path, verify=True) == entries
+    assert manifest_path.stat().st_mtime_ns == mtime, (
+        'Манифест неизменённого архива не должен строиться заново'
+    )
+
+
+def test_manifest_survives_rewrite_with_same_content(
+        archive_path, monkeypatch):
+    archive.load_manifest(archive_path, verify=True)
+    data = archive_path.read_bytes()
+    archive_path.write_bytes(data)
+    stat = archive_path.stat()
+    os.utime(archive_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError('Манифест перестроен')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(archive, 'build_manifest', fail_build)
+        archive.load_manifest(archive_path, verify=True)
+
+    with zipfile.ZipFile(archive_path, 'a') as zip_file:
+        zip_file.writestr('docs-pdf/new.pdf', b'%PDF new')
+    entries = archive.load_manifest(archive_path)
+    assert 'docs-pdf/new.pdf' in [entry.name for entry in entries], (
+        'Манифест должен перестраиваться при изменении содержимого архива'
+    )
+
+
+def test_download_archive_bypasses_http_cache(archive_path, tmp_path):
+    download_url = MAIN_DOC_URL + 'download.html'
+    archive_url = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    session = CachedSession(backend='memory')
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            download_url,
+            text=(
+                '<table class="docutils"><tr><td>'
+                '<a href="archives/python-docs-pdf-a4.zip">PDF</a>'
+                '</td></tr></table>'
+            )
+        )
+        mock.get(archive_url, content=archive_path.read_bytes())
+        got = utils.download_pdf_archive(
+            session, MAIN_DOC_URL, tmp_path / 'downloads')
+
+    assert got.read_bytes() == archive_path.read_bytes()
+    assert session.cache.contains(url=download_url)
+    assert not session.cache.contains(url=archive_url), (
+        'Архив не должен сохраняться в HTTP-кэш'
+    )
+
+
+@pytest.mark.parametrize('manifest', [
+    '{"signature": "', '[]', '{"entries": []}', '{"signature": null}',
+])
+def test_malformed_manifest_is_rebuilt(archive_path, manifest):
+    manifest_path = archive.get_manifest_path(archive_path)
+    manifest_path.write_text(manifest, encoding='utf-8')
+    entries = archive.load_manifest(archive_path)
+    assert sorted(entry.name for entry in entries) == sorted(FILES), (
+        'Повреждённый манифест должен строиться заново'
+    )
+    assert archive.load_manifest(archive_path) == entries
+
+
+def test_verify_detects_corrupted_entry(archive_path):
+    data = bytearray(archive_path.read_bytes())
+    offset = data.index(b'docs-pdf/library.pdf') + len('docs-pdf/library.pdf')
+    data[offset + 10] ^= 0xFF
+    archive_path.write_bytes(bytes(data))
+
+    archive.load_manifest(archive_path)
+    with pytest.raises(ArchiveError):
+        archive.load_manifest(archive_path, verify=True)
+
+
+def test_broken_archive_raises_archive_error(tmp_path):
+    path = tmp_path / 'broken.zip'
+    path.write_bytes(b'not a zip archive')
+    with pytest.raises(ArchiveError):
+        archive.load_manifest(path)
+
+
+def test_extract_selected_members_once(archive_path, tmp_path, monkeypatch):
+    target_dir = tmp_path / 'docs'
+    paths = archive.extract_members(
+        archive_path, ['*library*', '*logging*'], target_dir)
+    assert sorted(path.name for path in paths) == [
+        'howto-logging.pdf', 'library.pdf'
+    ]
+    assert not (target_dir / 'docs-pdf' / 'tutorial.pdf').exists(), (
+        'Распаковываться должны только файлы, подходящие под шаблоны'
+    )
+    assert (target_dir / 'docs-pdf' / 'library.pdf').read_bytes() == (
+        FILES['docs-pdf/library.pdf'])
+
+    def fail_extract(*args, **kwargs):
+        raise AssertionError('Файл уже распакован')
+
+    monkeypatch.setattr(zipfile.ZipFile, 'extract', fail_extract)
+    assert archive.extract_members(
+        archive_path, ['*library*'], target_dir
+    ) == [target_dir / 'docs-pdf' / 'library.pdf']
@@ -0,0 +1,83 @@
+import bs4
+import pytest
+import requests
+import requests_mock
+
+try:
+    from src import utils
+    from src.checkpoint import PepCheckpoint
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoint.py`'
+
+NUMERICAL_URL = 'https://peps.python.org/numerical/'
+PEPS = ((1, 'PA', 'Active'), (8, 'PF', 'Final'), (9, 'IW', 'Withdrawn'))
+
+
+def get_pep_rows():
+    return bs4.BeautifulSoup(
+        '<table><tr><th>Header</th></tr>'
+        + ''.join(
+            f'<tr><td>{code}</td><td><a href="../pep-{number:04d}/">'
+            f'{number}</a></td><td>Title</td><td>Author</td></tr>'
+            for number, code, _ in PEPS
+        )
+        + '</table>',
+        features='lxml'
+    ).find_all('tr')
+
+
+def pep_page(status):
+    return f'<dl><dt>Status:</dt><dd>{status}</dd></dl>'
+
+
+def test_resume_skips_completed_rows(tmp_path):
+    path = tmp_path / 'pep_checkpoint.json'
+    session = requests.Session()
+
+    with requests_mock.Mocker() as mock:
+        for number, _, status in PEPS[:2]:
+            mock.get(
+                f'https://peps.python.org/pep-{number:04d}/',
+                text=pep_page(status)
+            )
+        mock.get('https://peps.python.org/pep-0009/', status_code=503)
+        _, _, total = utils.analyze_peps(
+            session, (get_pep_rows(), NUMERICAL_URL),
+            PepCheckpoint(path, save_every=1)
+        )
+    assert total == 2 and path.exists(), (
+        'Обработанные строки PEP должны сохраняться в точку сохранения'
+    )
+
+    with requests_mock.Mocker() as mock:
+        mock.get('https://peps.python.org/pep-0009/', text=pep_page(
+            'Withdrawn'))
+        status_counter, _, total = utils.analyze_peps(
+            session, (get_pep_rows(), NUMERICAL_URL),
+            PepCheckpoint.load(path)
+        )
+        fetched = [request.url for request in mock.request_history]
+
+    assert fetched == ['https://peps.python.org/pep-0009/'], (
+        'При возобновлении загружаются только необработанные строки'
+    )
+    assert status_counter == {'Active': 1, 'Final': 1, 'Withdrawn': 1}, (
+        'Результаты прошлого запуска должны объединяться с новыми'
+    )
+    assert total == 3
+
+
+@pytest.mark.parametrize('content', [
+    '[["1", "https://peps.python.org/pep-0001/", "Act',
+    '{"1": "Active"}',
+    '[["1", "https://peps.python.org/pep-0001/"]]',
+    '5',
+])
+def test_corrupt_checkpoint_starts_over(tmp_path, caplog, content):
+    path = tmp_path / 'checkpoint.json'
+    path.write_text(content, encoding='utf-8')
+    checkpoint = PepCheckpoint.load(path)
+    assert checkpoint.statuses == {}, (
+        'Повреждённый файл состояния должен заменяться пустым состоянием'
+    )
+    assert 'повреждён' in caplog.text
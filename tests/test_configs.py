@@ -1,9 +1,13 @@
 import argparse
+import json
+import logging
+from logging.handlers import QueueHandler
 
 import pytest
 
 try:
-    from src import configs
+    from src import configs, constants
+    from src.exceptions import ConfigError
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `configs.py`'
 except ImportError:
@@ -66,3 +70,93 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+def test_configure_logging_queued(monkeypatch, tmp_path):
+    monkeypatch.setattr(constants, 'LOG_DIR_NAME', tmp_path)
+    monkeypatch.setattr(constants, 'LOG_FILE_NAME', tmp_path / 'parser.log')
+    root_logger = logging.getLogger()
+    handlers, level = root_logger.handlers[:], root_logger.level
+
+    listener = configs.configure_logging(queued=True)
+    try:
+        assert any(
+            isinstance(handler, QueueHandler)
+            for handler in root_logger.handlers
+        ), 'В режиме очереди корневой логгер должен писать в QueueHandler'
+        logging.warning('Несовпадение статуса PEP')
+    finally:
+        configs.stop_logging(listener)
+        root_logger.handlers, root_logger.level = handlers, level
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / 'parser.log').read_text(
+            encoding='utf-8').splitlines()
+    ]
+    assert records and records[-1]['message'] == 'Несовпадение статуса PEP', (
+        'Записи лога в режиме очереди должны сохраняться в формате JSON'
+    )
+
+
+def test_load_settings_layers(tmp_path):
+    config_file = tmp_path / 'parser.toml'
+    config_file.write_text(
+        'timeout = 10\nmax_workers = 4\nstatus_forcelist = [500, 503]\n'
+        "parser_engine = 'html.parser'\n",
+        encoding='utf-8'
+    )
+    got = configs.load_settings(
+        config_file,
+        overrides=['max-workers=16'],
+        environ={'BS4_PARSER_TIMEOUT': '2.5', 'BS4_PARSER_RATE_LIMIT': '3'}
+    )
+    assert got.timeout == 2.5, 'Переменные окружения перекрывают TOML-файл'
+    assert got.max_workers == 16, 'Параметры --set перекрывают остальные слои'
+    assert got.status_forcelist == (500, 503)
+    assert got.parser_engine == 'html.parser' and got.rate_limit == 3.0
+    assert got.total_retries == configs.DEFAULT_SETTINGS.total_retries
+
+
+@pytest.mark.parametrize('overrides', [
+    ['unknown=1'], ['max_workers=many'], ['timeout'],
+])
+def test_load_settings_rejects_invalid_values(overrides):
+    with pytest.raises(ConfigError):
+        configs.load_settings(overrides=overrides, environ={})
+
+
+@pytest.mark.parametrize('keep', ['0', '-3', 'all'])
+def test_keep_must_be_positive(keep, capsys):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--keep', keep])
+    assert '--keep' in capsys.readouterr().err
+    assert parser.parse_args(['pep', '--keep', '2']).keep == 2
+
+
+def test_mode_options_belong_to_their_mode(capsys):
+    parser = configs.configure_argument_parser(['pep', 'crawl'])
+    args = parser.parse_args(['crawl', '--max-pages', '5', '-o', 'file'])
+    assert args.output == 'file'
+    assert configs.get_mode_options(parser, args) == {
+        'start_url': constants.MAIN_DOC_URL,
+        'max_pages': 5,
+        'max_depth': None,
+    }, 'Режим должен получать только свои параметры'
+    assert configs.get_mode_options(
+        parser, parser.parse_args(['pep', '--resume'])) == {'resume': True}
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--max-pages', '5'])
+    assert '--max-pages' in capsys.readouterr().err, (
+        'Параметр другого режима должен приводить к ошибке'
+    )
+
+
+def test_mode_help_lists_mode_options(capsys):
+    parser = configs.configure_argument_parser(['pep', 'crawl'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['crawl', '--help'])
+    help_text = capsys.readouterr().out
+    assert '--max-pages' in help_text
+    assert '--resume' not in help_text
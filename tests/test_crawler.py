@@ -0,0 +1,147 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests_cache import CachedSession
+
+try:
+    from src import main, utils
+    from src.configs import DEFAULT_SETTINGS
+    from src.crawler import BloomFilter, Crawler
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `crawler.py`'
+
+SITE = {
+    'robots.txt': 'User-agent: *\nDisallow: /docs/private/\n',
+    'docs/index.html': (
+        '<a href="library/">Library</a>'
+        '<a href="whatsnew.html#top">What\'s New</a>'
+        '<a href="https://example.com/">External</a>'
+        '<a href="private/secret.html">Private</a>'
+        '<a href="/outside.html">Outside</a>'
+        '<a href="/moved.html">Moved</a>'
+    ),
+    'docs/library/index.html': (
+        '<a href="../index.html">Home</a>'
+        '<a href="missing.html">Missing</a>'
+        '<a href="../archive.zip">Archive</a>'
+    ),
+    'docs/whatsnew.html': (
+        '<a href="library/">Library</a><a href="gone/">Gone</a>'
+    ),
+    'docs/archive.zip': 'PK',
+    'docs/private/secret.html': '<a href="nowhere.html">Nowhere</a>',
+    'outside.html': '<a href="nowhere.html">Nowhere</a>',
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_request(self, code='-', size='-'):
+        self.server.requests.append((self.command, self.path))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def static_site(tmp_path):
+    for name, content in SITE.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0), partial(QuietHandler, directory=str(tmp_path)))
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/docs/', server
+    server.shutdown()
+    server.server_close()
+
+
+def test_crawl_reports_broken_internal_links(static_site):
+    start_url, server = static_site
+    host = start_url[:-len('docs/')]
+    results = main.crawl(requests.Session(), start_url)
+    assert results[0] == ('Ссылка', 'Статус', 'Найдена на странице')
+    assert sorted(
+        (url.replace(host, ''), status, referrer.replace(host, ''))
+        for url, status, referrer in results[1:]
+    ) == [
+        ('docs/gone/', 404, 'docs/whatsnew.html'),
+        ('docs/library/missing.html', 404, 'docs/library/'),
+        ('moved.html', 404, 'docs/'),
+    ], (
+        'Должны находиться все битые ссылки на тот же хост, а внешние и '
+        'запрещённые robots.txt не проверяться'
+    )
+    assert ('HEAD', '/outside.html') in server.requests, (
+        'Страницы вне раздела стартового адреса проверяются запросом HEAD'
+    )
+    assert ('GET', '/outside.html') not in server.requests
+    assert ('HEAD', '/nowhere.html') not in server.requests, (
+        'Ссылки со страниц вне раздела не должны проверяться'
+    )
+
+
+def test_crawl_respects_limits(static_site):
+    start_url, _ = static_site
+    crawler = Crawler(start_url, max_depth=0)
+    assert crawler.crawl() == [] and crawler.pages == 1
+    crawler = Crawler(start_url, max_pages=3)
+    crawler.crawl()
+    assert crawler.pages == 3, 'Обход должен останавливаться на max_pages'
+    assert len(crawler.visited) == 3, (
+        'В очередь обхода не должно попадать больше адресов, чем max_pages'
+    )
+
+
+def test_crawl_bypasses_http_cache(static_site):
+    start_url, server = static_site
+    session = CachedSession(backend='memory')
+    main.crawl(session, start_url)
+    assert not list(session.cache.responses.keys()), (
+        'Обход не должен сохранять страницы в HTTP-кэш'
+    )
+    requests_count = len(server.requests)
+    main.crawl(session, start_url)
+    assert len(server.requests) == 2 * requests_count, (
+        'Повторный обход должен заново запрашивать все адреса'
+    )
+
+
+def test_crawl_uses_own_rate_limited_session(static_site):
+    start_url, _ = static_site
+    settings = DEFAULT_SETTINGS._replace(rate_limit=3)
+    crawler = Crawler(start_url, settings=settings)
+    adapter = crawler.session.get_adapter(start_url)
+    assert not isinstance(crawler.session, CachedSession)
+    assert isinstance(adapter, utils.RateLimitedAdapter)
+    assert adapter.rate_limiter.interval == pytest.approx(1 / 3)
+    assert not hasattr(crawler, 'rate_limiter'), (
+        'Частоту запросов должен ограничивать только адаптер сессии'
+    )
+    crawler.close()
+
+
+def test_bloom_filter_is_compact_and_has_no_false_negatives():
+    bloom = BloomFilter(capacity=20_000, error_rate=0.01)
+    urls = [f'https://docs.python.org/3/page-{number}.html'
+            for number in range(20_000)]
+    assert all(bloom.add(url) for url in urls[:100])
+    for url in urls[100:]:
+        bloom.add(url)
+    assert all(url in bloom for url in urls), (
+        'Добавленные адреса всегда должны считаться посещёнными'
+    )
+    false_positives = sum(
+        f'https://docs.python.org/3/other-{number}.html' in bloom
+        for number in range(20_000)
+    )
+    assert false_positives < 20_000 * 0.02
+    assert len(bloom.bits) < 20_000 * 2, (
+        'Фильтр должен занимать порядка байта на адрес'
+    )
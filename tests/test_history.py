@@ -0,0 +1,47 @@
+try:
+    from src import constants, main
+    from src.history import PepHistory
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+
+
+def test_only_changes_are_stored(tmp_path):
+    history = PepHistory(tmp_path / 'history.jsonl')
+    runs = [
+        ('2026-01-01T10:00:00', {'1': 'Draft', '8': 'Active'}),
+        ('2026-02-01T10:00:00', {'1': 'Draft', '8': 'Active'}),
+        ('2026-03-01T10:00:00', {'1': 'Accepted', '8': 'Active'}),
+        ('2026-04-01T10:00:00', {'1': 'Final', '8': 'Active', '9': 'Draft'}),
+    ]
+    changes = [history.record(statuses, at) for at, statuses in runs]
+
+    assert changes == [2, 0, 1, 2], (
+        'В журнал должны записываться только изменившиеся статусы PEP'
+    )
+    assert len(history.path.read_text().splitlines()) == 5
+    assert history.transitions('1') == [
+        ('2026-01-01T10:00:00', 'Draft'),
+        ('2026-03-01T10:00:00', 'Accepted'),
+        ('2026-04-01T10:00:00', 'Final'),
+    ]
+    assert history.statuses_at('2026-03-01') == {
+        '1': 'Accepted', '8': 'Active'
+    }, 'Состояние на дату должно восстанавливаться по журналу изменений'
+    assert history.statuses_at('2025-12-31') == {}
+
+
+def test_pep_history_counts_over_time(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        constants, 'PEP_HISTORY_PATH', tmp_path / 'history.jsonl')
+    history = PepHistory()
+    history.record({'1': 'Draft', '8': 'Draft'}, '2026-01-01T10:00:00')
+    history.record({'1': 'Final'}, '2026-02-01T10:00:00')
+
+    assert main.pep_history(None) == [
+        ('Дата', 'Draft', 'Final', 'Total'),
+        ('2026-01-01T10:00:00', 2, 0, 2),
+        ('2026-02-01T10:00:00', 1, 1, 2),
+    ]
+    assert main.pep_history(None, at='2026-01-15')[1:] == [
+        ('Draft', 2), ('Total', 2)
+    ]
@@ -1,9 +1,11 @@
 from pathlib import Path
 
 import pytest
+import requests_mock
+from conftest import MAIN_DOC_URL
 
 try:
-    from src import main
+    from src import main, utils
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
 except ImportError:
@@ -142,3 +144,82 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+def test_latest_versions_cached(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(
+        utils, 'LATEST_VERSIONS_CACHE_PATH', tmp_path / 'versions.json')
+    sidebar = (
+        '<div class="sphinxsidebarwrapper"><ul><li>Docs</li></ul><ul>'
+        '<li><a href="https://docs.python.org/3.13/">Python 3.13 (stable)'
+        '</a></li><li><a href="https://docs.python.org/3.9/">Python 3.9 '
+        '(security-fixes)</a></li><li><a href="https://www.python.org/doc/'
+        'versions/">All versions</a></li></ul></div>'
+    )
+    downloads = (
+        '<div class="row active-release-list-widget"><ol><li>'
+        '<span class="release-version">3.13</span>'
+        '<span class="release-status">bugfix</span></li><li>'
+        '<span class="release-version">3.9</span>'
+        '<span class="release-status">end of life</span></li></ol></div>'
+    )
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL, text=sidebar)
+        mock.get('https://www.python.org/downloads/', text=downloads)
+        got = main.latest_versions(mock_session)
+        mismatches = utils.check_versions_against_downloads(
+            mock_session, got)
+        cached = main.latest_versions(mock_session)
+        requested = [request.url for request in mock.request_history]
+
+    assert got == [
+        ('https://docs.python.org/3.13/', '3.13', 'stable'),
+        ('https://docs.python.org/3.9/', '3.9', 'security-fixes'),
+        ('https://www.python.org/doc/versions/', 'All versions', ''),
+    ]
+    assert sorted(got, key=lambda entry: entry.number)[-1].number == (
+        3, 13
+    ), 'Версии должны сортироваться по числовому номеру'
+    assert cached == got and requested.count(MAIN_DOC_URL) == 1, (
+        'Повторный вызов `latest_versions` должен брать результат из кэша'
+    )
+    assert len(mismatches) == 1 and '3.9' in mismatches[0], (
+        'Сверка со страницей загрузок должна находить расхождение статусов'
+    )
+
+
+def test_modes_are_parser_methods():
+    assert main.AVAILABLE_MODES == tuple(main.MODES)
+    for mode, method in main.MODES.items():
+        assert getattr(main.Parser, mode.replace('-', '_')) is method, (
+            f'Режим {mode} должен запускаться методом `Parser`'
+        )
+    assert 'run' not in main.MODES and 'close' not in main.MODES
+
+
+def test_parser_reuses_session(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(
+        utils, 'LATEST_VERSIONS_CACHE_PATH', tmp_path / 'versions.json')
+    sidebar = (
+        '<div class="sphinxsidebarwrapper"><ul><li><a href="3.13/">'
+        'Python 3.13 (stable)</a></li><li><a href="versions/">All versions'
+        '</a></li></ul></div>'
+    )
+    with main.Parser(session=mock_session) as parser:
+        with requests_mock.Mocker() as mock:
+            mock.get(MAIN_DOC_URL, text=sidebar)
+            first = parser.run('latest-versions')
+            parser.clear_cache()
+            second = parser.latest_versions()
+        assert parser.session is mock_session, (
+            '`Parser` должен использовать одну сессию для всех вызовов'
+        )
+        with pytest.raises(ValueError):
+            parser.run('unknown')
+
+    assert first == second == [
+        ('3.13/', '3.13', 'stable'), ('versions/', 'All versions', '')
+    ]
+    assert parser.executor._shutdown, (
+        'При выходе из контекста `Parser` должен останавливать пул потоков'
+    )
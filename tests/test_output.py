@@ -1,12 +1,15 @@
+import csv
+import gzip
 from argparse import Namespace
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import pytest
+from prettytable import PrettyTable
 
 try:
-    from src import outputs
+    from src import constants, outputs
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `outputs.py`'
 except ImportError:
@@ -92,3 +95,60 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+@pytest.mark.parametrize('rows', [
+    [
+        (f'https://docs.python.org/3.{number}/', f'3.{number}',
+         'stable' if number % 3 else 'security-fixes')
+        for number in range(1_000)
+    ],
+    [
+        ('https://docs.python.org/ja/3/', '3.13', '新しい機能'),
+        ('https://docs.python.org/fr/3/', '3.12', 'Nouveauté\u0301s'),
+        ('https://docs.python.org/ko/3/', '3.11', '새로운 기능'),
+    ],
+])
+def test_pretty_output_matches_prettytable(capsys, rows):
+    results = [('Ссылка', 'Версия', 'Статус')] + rows
+    table = PrettyTable()
+    table.field_names = results[0]
+    table.align = constants.TABLE_ALIGN
+    table.add_rows(results[1:])
+    print(table)
+    expected, _ = capsys.readouterr()
+
+    outputs.pretty_output(results)
+    got, _ = capsys.readouterr()
+
+    assert got == expected, (
+        'Функция `pretty_output` должна выводить таблицу в формате '
+        'PrettyTable, в том числе с широкими и комбинируемыми символами'
+    )
+
+
+def test_file_output_compression_retention_latest(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    results_dir = tmp_path / 'results'
+    results_dir.mkdir()
+    for day in range(1, 4):
+        (results_dir / f'pep_2024-01-0{day}_00-00-00.csv').write_text('old')
+    (results_dir / 'pep-history_2024-01-01_00-00-00.csv').write_text('old')
+    records = [('Status', 'Count'), ('Active', '36')]
+
+    outputs.file_output(records, Namespace(
+        mode='pep', output='file', compress='gzip', keep=2
+    ))
+
+    latest = (results_dir / 'pep.latest').read_text().strip()
+    assert latest.startswith('pep_') and latest.endswith('.csv.gz'), (
+        'Файл `<режим>.latest` должен указывать на последний результат'
+    )
+    with gzip.open(results_dir / latest, 'rt', encoding='utf-8') as f:
+        assert [tuple(row) for row in csv.reader(f)] == records
+    assert sorted(path.name for path in results_dir.iterdir()) == [
+        'pep-history_2024-01-01_00-00-00.csv',
+        'pep.latest',
+        'pep_2024-01-03_00-00-00.csv',
+        latest,
+    ], 'Должны храниться только последние файлы режима, без временных'
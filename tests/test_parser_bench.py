@@ -0,0 +1,75 @@
+import pytest
+import requests_mock
+from requests_cache import CachedSession
+
+try:
+    from src import configs, main, parser_bench
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `parser_bench.py`'
+    )
+
+PEP_PAGE = (
+    '<html><body><section><h1>PEP {number} – Title</h1>'
+    '<dl><dt>Status:</dt><dd><abbr>Final</abbr></dd></dl>'
+    '<a href="../pep-0001/">PEP 1</a></section></body></html>'
+)
+
+
+def get_cached_session():
+    session = CachedSession(backend='memory')
+    adapter = requests_mock.Adapter()
+    session.mount('https://', adapter)
+    for number in range(5):
+        adapter.register_uri(
+            'GET',
+            f'https://peps.python.org/pep-{number:04d}/',
+            text=PEP_PAGE.format(number=number),
+            headers={'Content-Type': 'text/html; charset=utf-8'},
+        )
+        session.get(f'https://peps.python.org/pep-{number:04d}/')
+    adapter.register_uri('GET', 'https://peps.python.org/api/', json={})
+    session.get('https://peps.python.org/api/')
+    return session
+
+
+def test_recorded_pages_are_html_only():
+    pages = parser_bench.get_recorded_pages(get_cached_session())
+    assert len(pages) == 5, (
+        'Для сравнения парсеров должны браться только HTML-страницы из кэша.'
+    )
+
+
+def test_benchmark_parsers_compares_with_reference():
+    pages = parser_bench.get_recorded_pages(get_cached_session())
+    engines = parser_bench.available_parser_engines()
+    assert 'lxml' in engines and 'html.parser' in engines, (
+        'Установленные парсеры должны определяться как доступные.'
+    )
+    results = parser_bench.benchmark_parsers(pages, engines, 'lxml')
+    assert {result.engine for result in results} == set(engines)
+    for result in results:
+        assert result.pages == 5 and result.matches == 5, (
+            f'Парсер {result.engine} должен извлекать те же данные, '
+            'что и эталонный.'
+        )
+        assert result.pages_per_second > 0
+
+
+def test_unavailable_engine_is_skipped():
+    assert parser_bench.available_parser_engines(('no-such-parser',)) == [], (
+        'Неустановленный парсер не должен попадать в сравнение.'
+    )
+
+
+def test_bench_parsers_mode():
+    results = main.bench_parsers(get_cached_session())
+    assert results[0] == ('Парсер', 'Страниц', 'Страниц/с', 'Совпадений')
+    assert len(results) > 2
+
+
+def test_parser_engine_setting_is_validated():
+    settings = configs.load_settings(overrides=['parser_engine=html.parser'])
+    assert settings.parser_engine == 'html.parser'
+    with pytest.raises(configs.ConfigError):
+        configs.load_settings(overrides=['parser_engine=selectolax'])
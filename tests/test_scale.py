@@ -0,0 +1,119 @@
+import gc
+import tracemalloc
+from collections import Counter
+
+import pytest
+import requests
+import requests_mock
+
+from src import utils
+from tests.fixture_data.synthetic import (MALFORMATIONS, SyntheticPeps,
+                                          status_dl, versions_ul)
+
+ROWS = 10_000
+
+
+def get_session(synthetic, keep_history=True):
+    """Сессия, которой отвечают страницы synthetic.
+
+    Без keep_history история запросов адаптера очищается после каждого
+    ответа: она растёт с числом запросов и искажала бы измерения памяти.
+    """
+    session = requests.Session()
+    session.trust_env = False
+    adapter = requests_mock.Adapter()
+    synthetic.register(adapter)
+    session.mount('https://', adapter)
+    if not keep_history:
+        session.hooks['response'].append(
+            lambda response, *args, **kwargs: adapter.reset())
+    return session, adapter
+
+
+def analyze(synthetic):
+    session, adapter = get_session(synthetic)
+    results = utils.analyze_peps(session, synthetic.pep_rows())
+    assert Counter(
+        request.url for request in adapter.request_history
+    ) == Counter(synthetic.pep_urls()), (
+        'Каждая страница PEP из таблицы должна загружаться ровно один раз'
+    )
+    return results
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_analyze_peps_invariants_on_malformed_data(seed):
+    rates = {name: 0.03 for name in MALFORMATIONS}
+    synthetic = SyntheticPeps(500, rates=rates, seed=seed)
+    status_counter, inappropriate_statuses, total = analyze(synthetic)
+
+    assert status_counter == synthetic.expected_counter(), (
+        'Подсчёт статусов должен учитывать только корректные страницы PEP'
+    )
+    assert total == len(synthetic.processed()) == sum(
+        status_counter.values())
+    assert sorted(item.pep_url for item in inappropriate_statuses) == sorted(
+        synthetic.expected_mismatches()
+    ), 'Все несовпадения статусов должны попадать в отчёт'
+
+
+def parse_rows(pep_data):
+    rows, base_url = pep_data
+    return [utils.parse_pep_row(row, base_url) for row in rows[1:]]
+
+
+def test_parse_pep_rows_on_ten_thousand_rows():
+    synthetic = SyntheticPeps(ROWS, rates={'short_row': 0.01}, seed=42)
+    pep_data = synthetic.pep_rows()
+    pep_refs = [pep_ref for pep_ref in parse_rows(pep_data) if pep_ref]
+    assert len(pep_refs) == ROWS - sum(
+        pep.malformation == 'short_row' for pep in synthetic.peps
+    ), 'Короткие строки таблицы должны пропускаться'
+    assert pep_refs[-1].url == 'https://peps.python.org/pep-10000/'
+
+
+def test_analyze_peps_on_thousands_of_rows():
+    synthetic = SyntheticPeps(ROWS // 4, rates={'mismatch': 0.01}, seed=42)
+    status_counter, inappropriate_statuses, total = analyze(synthetic)
+    assert total == ROWS // 4
+    assert status_counter == synthetic.expected_counter()
+    assert len(inappropriate_statuses) == len(
+        synthetic.expected_mismatches())
+
+
+def measure_analyze_peak(synthetic):
+    session, _ = get_session(synthetic, keep_history=False)
+    pep_data = synthetic.pep_rows()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        utils.analyze_peps(session, pep_data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def test_analyze_peps_memory_is_bounded():
+    small_peak = measure_analyze_peak(SyntheticPeps(100, padding=20))
+    large_peak = measure_analyze_peak(SyntheticPeps(400, padding=20))
+    assert large_peak < small_peak * 1.5, (
+        'Пиковое потребление памяти при обработке PEP не должно расти с '
+        'числом страниц'
+    )
+
+
+def test_extract_status_from_dl_on_long_list():
+    assert utils.extract_status_from_dl(status_dl(ROWS // 2)) == 'Final'
+    assert utils.extract_status_from_dl(
+        status_dl(ROWS // 2, status='Draft')) == 'Draft'
+
+
+def test_parse_versions_list_on_ten_thousand_versions():
+    ul_tag = versions_ul(ROWS)
+    entries = utils.parse_versions_list(ul_tag)
+    assert len(entries) == ROWS + 1
+    assert entries[-1].version == 'All versions'
+    assert all(entry.status for entry in entries[:-1]), (
+        'У каждой версии из списка должен определяться статус'
+    )
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+try:
+    from src import server
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+
+class SlowCompute:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, mode):
+        self.calls.append(mode)
+        time.sleep(self.delay)
+        return [('Status', 'Count'), ('Active', len(self.calls))]
+
+
+def test_concurrent_requests_share_one_computation():
+    compute = SlowCompute()
+    cache = server.ResultCache(compute)
+    got = []
+    threads = [
+        threading.Thread(target=lambda: got.append(cache.get('pep')))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.close()
+
+    assert compute.calls == ['pep'], (
+        'Одновременные запросы одного режима должны выполнять одно вычисление'
+    )
+    assert len(got) == 5 and all(result == got[0] for result in got)
+
+
+def test_stale_result_is_served_while_revalidating():
+    compute = SlowCompute(delay=0.1)
+    cache = server.ResultCache(compute, ttl=0, stale_ttl=60)
+    first = cache.get('pep')
+
+    started = time.monotonic()
+    stale = cache.get('pep')
+    assert time.monotonic() - started < compute.delay, (
+        'Устаревший результат должен отдаваться без ожидания пересчёта'
+    )
+    assert stale == first
+    cache.close()
+    assert len(compute.calls) == 2, 'Устаревший результат пересчитывается в фоне'
+
+
+class FakeParser:
+    def run(self, mode):
+        return [('Status', 'Count'), ('Active', 1)]
+
+
+@pytest.fixture
+def http_server():
+    api_server = server.create_server(FakeParser(), port=0)
+    thread = threading.Thread(target=api_server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{api_server.server_port}'
+    api_server.shutdown()
+    api_server.server_close()
+    api_server.result_cache.close()
+
+
+def test_http_api_returns_mode_results(http_server):
+    with urlopen(f'{http_server}/pep') as response:
+        payload = json.load(response)
+    assert payload == {
+        'mode': 'pep', 'results': [['Status', 'Count'], ['Active', 1]]
+    }, 'HTTP API должен отдавать результаты режима в формате JSON'
+
+    with pytest.raises(HTTPError) as excinfo:
+        urlopen(f'{http_server}/download')
+    assert excinfo.value.code == 404
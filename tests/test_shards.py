@@ -0,0 +1,102 @@
+import logging
+
+import requests_mock
+from requests_cache import CachedSession
+
+try:
+    from src import main, shards
+    from src.records import PepRef, StatusCount
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+
+PEP_URL = 'https://peps.python.org/pep-{:04d}/'
+PEP_COUNT = 30
+
+
+def real_status(number):
+    return 'Draft' if number % 10 == 0 else 'Final'
+
+
+def get_pep_refs():
+    return [
+        PepRef(str(number), 'F', PEP_URL.format(number))
+        for number in range(PEP_COUNT, 0, -1)
+    ]
+
+
+def mock_session_factory():
+    session = CachedSession(backend='memory')
+    adapter = requests_mock.Adapter()
+    for number in range(1, PEP_COUNT + 1):
+        adapter.register_uri(
+            'GET',
+            PEP_URL.format(number),
+            text=(
+                '<dl><dt>Status:</dt>'
+                f'<dd>{real_status(number)}</dd></dl>'
+            ),
+        )
+    session.mount('https://', adapter)
+    return session
+
+
+def test_split_into_shards_by_number_range():
+    parts = shards.split_into_shards(get_pep_refs(), shard_size=8)
+    assert [len(part) for part in parts] == [8, 8, 8, 6]
+    first_numbers = [int(pep_ref.number) for pep_ref in parts[0]]
+    assert first_numbers == list(range(1, 9)), (
+        'Шарды должны содержать PEP из последовательных диапазонов номеров.'
+    )
+
+
+def test_workers_processes_share_queue(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    queue_path = tmp_path / 'shards.sqlite3'
+    with shards.ShardQueue(queue_path) as queue:
+        queue.fill(shards.split_into_shards(get_pep_refs(), shard_size=5))
+
+    shards.run_workers(mock_session_factory, queue_path, workers=3)
+
+    with shards.ShardQueue(queue_path) as queue:
+        assert queue.count_unfinished() == 0, (
+            'Процессы-обработчики должны обработать все шарды очереди.'
+        )
+        status_counter, mismatches, total = queue.reduce()
+    assert status_counter == {'Draft': 3, 'Final': 27}
+    assert sum('шард' in message for message in caplog.messages) == 6, (
+        'Логи процессов-обработчиков должны попадать в лог основного процесса'
+    )
+    assert total == PEP_COUNT, (
+        'Каждый PEP должен быть учтён в итоговом результате ровно один раз.'
+    )
+    assert sorted(mismatch.pep_url for mismatch in mismatches) == sorted(
+        PEP_URL.format(number) for number in (10, 20, 30)
+    )
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    with shards.ShardQueue(tmp_path / 'q.sqlite3', lease_timeout=0) as queue:
+        queue.fill(shards.split_into_shards(get_pep_refs()[:3]))
+        first = queue.claim('worker-1')
+        second = queue.claim('worker-2')
+    assert first is not None and second is not None
+    assert first[0] == second[0], (
+        'Шард, не завершённый в срок, должен выдаваться другому обработчику.'
+    )
+
+
+def test_pep_shards_resume_reduces_results(tmp_path):
+    queue_path = tmp_path / 'shards.sqlite3'
+    with shards.ShardQueue(queue_path) as queue:
+        queue.fill(shards.split_into_shards(get_pep_refs(), shard_size=10))
+        shard_id, pep_refs = queue.claim('worker')
+        queue.complete(shard_id, {'Final': len(pep_refs)}, [], len(pep_refs))
+
+    results = main.pep_shards(
+        None, mock_session_factory, queue_path, workers=2, resume=True)
+    assert results == [
+        StatusCount('Status', 'Count'),
+        StatusCount('Draft', 2),
+        StatusCount('Final', 28),
+        StatusCount('Total', PEP_COUNT),
+    ], 'Результат должен объединять ранее и вновь обработанные шарды.'
@@ -1,3 +1,9 @@
+import gc
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
 import bs4
 import pytest
 import requests
@@ -6,6 +12,7 @@ from conftest import MAIN_DOC_URL
 
 try:
     from src import utils
+    from src.records import PepStatus
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `utils.py`'
 except ImportError:
@@ -55,3 +62,236 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_parse_whats_new_sections_isolates_errors(mock_session):
+    base_url = MAIN_DOC_URL + 'whatsnew/'
+    versions = ('3.12', '3.11', '3.10', '3.9')
+    sections = bs4.BeautifulSoup(
+        ''.join(
+            f'<li class="toctree-l1"><a href="{version}.html">{version}</a>'
+            '</li>'
+            for version in versions
+        ),
+        features='lxml'
+    ).find_all('li', class_='toctree-l1')
+    with requests_mock.Mocker() as mock:
+        for version in versions:
+            mock.get(
+                f'{base_url}{version}.html',
+                text=(
+                    f'<h1>What’s New In Python {version}</h1>'
+                    f'<dl><dt>Editor</dt><dd>Author {version}</dd></dl>'
+                ),
+            )
+        mock.get(f'{base_url}3.11.html', status_code=500)
+
+        got = utils.parse_whats_new_sections(mock_session, sections, base_url)
+
+    assert [url for url, _, _ in got] == [
+        f'{base_url}3.12.html', f'{base_url}3.10.html', f'{base_url}3.9.html'
+    ], (
+        'Функция `parse_whats_new_sections` должна пропускать секции '
+        'с ошибками и сохранять порядок оглавления'
+    )
+
+
+def test_analyze_peps_compact_records(mock_session):
+    numerical_url = 'https://peps.python.org/numerical/'
+    rows = bs4.BeautifulSoup(
+        '<table><tr><th>Header</th></tr>'
+        + ''.join(
+            f'<tr><td>{code}</td><td><a href="../pep-{number:04d}/">'
+            f'{number}</a></td><td>Title</td><td>Author</td></tr>'
+            for number, code in ((1, 'PA'), (8, 'PF'), (9, 'IW'))
+        )
+        + '</table>',
+        features='lxml'
+    ).find_all('tr')
+    with requests_mock.Mocker() as mock:
+        for number, status in ((1, 'Active'), (8, 'Draft')):
+            mock.get(
+                f'https://peps.python.org/pep-{number:04d}/',
+                text=f'<dl><dt>Status:</dt><dd>{status}</dd></dl>'
+            )
+        mock.get('https://peps.python.org/pep-0009/', text='<dl></dl>')
+
+        status_counter, inappropriate, total = utils.analyze_peps(
+            mock_session, (rows, numerical_url)
+        )
+
+    assert status_counter == {'Active': 1, 'Draft': 1} and total == 2
+    assert inappropriate == [(
+        'https://peps.python.org/pep-0008/', ('Final',), 'Draft'
+    )], 'Несовпадение статуса должно сохраняться как компактная запись'
+    assert not any(
+        isinstance(value, bs4.element.Tag)
+        for item in inappropriate for value in item
+    ), 'Записи о несовпадениях не должны ссылаться на теги BeautifulSoup'
+
+
+def measure_pep_pages_peak(pages_count):
+    page = (
+        '<dl><dt>Status:</dt><dd>Final</dd></dl>'
+        + '<p><a href="#">link</a> text</p>' * 300
+    )
+    pep_refs = [
+        utils.PepRef(str(number), 'F', f'https://peps.python.org/{number}/')
+        for number in range(pages_count)
+    ]
+    session = requests.Session()
+    with requests_mock.Mocker() as mock:
+        mock.get(requests_mock.ANY, text=page)
+        for pep_ref in pep_refs[:5]:
+            utils.fetch_pep_status(session, pep_ref)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            for pep_ref in pep_refs:
+                utils.fetch_pep_status(session, pep_ref)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak
+
+
+def test_parsed_pages_memory_is_flat():
+    small_peak = measure_pep_pages_peak(10)
+    large_peak = measure_pep_pages_peak(50)
+    assert large_peak < small_peak * 1.5, (
+        'Пиковое потребление памяти не должно расти с числом страниц: '
+        'деревья BeautifulSoup нужно разрушать после извлечения данных'
+    )
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('http://docs.python.org/3/whatsnew/index.html#top',
+     'https://docs.python.org/3/whatsnew/'),
+    ('https://peps.python.org/numerical', 'https://peps.python.org/numerical/'),
+    ('https://PEPS.python.org:443/pep-0008/#id1',
+     'https://peps.python.org/pep-0008/'),
+    ('https://docs.python.org/3/whatsnew/3.12.html',
+     'https://docs.python.org/3/whatsnew/3.12.html'),
+    ('http://localhost:8000/docs/page', 'http://localhost:8000/docs/page'),
+])
+def test_canonicalize_url(url, expected):
+    assert utils.canonicalize_url(url) == expected, (
+        'Разные формы адреса одного документа должны приводиться к одной'
+    )
+
+
+def test_request_coalescer_fetches_document_once():
+    coalescer = utils.RequestCoalescer()
+    fetched = []
+
+    def get(url):
+        fetched.append(url)
+        time.sleep(0.1)
+        return url
+
+    urls = [
+        'https://peps.python.org/pep-0008/',
+        'https://peps.python.org/pep-0008',
+        'http://peps.python.org/pep-0008/#abstract',
+    ]
+    threads = [
+        threading.Thread(target=coalescer.fetch, args=(url, get))
+        for url in urls
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetched == ['https://peps.python.org/pep-0008/'], (
+        'Одновременные запросы одного документа должны выполняться один раз'
+    )
+    stats = coalescer.snapshot()
+    assert stats['requests'] == 3 and stats['unique'] == 1
+    assert stats['coalesced'] == 2 and stats['normalized'] == 2
+
+
+def test_get_pep_rows_fetches_numerical_index(mock_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            requests_mock.ANY,
+            text='<table><tr><td>SF</td><td>1</td></tr></table>'
+        )
+        rows, base_url = utils.get_pep_rows(mock_session)
+    assert [request.url for request in mock.request_history] == [
+        'https://peps.python.org/numerical/'
+    ], 'Таблица PEP должна загружаться со страницы numerical'
+    assert base_url == 'https://peps.python.org/numerical/'
+    assert len(rows) == 1
+
+
+def test_aggregate_pep_statuses_in_batch():
+    pep_statuses = [
+        PepStatus(str(number), f'https://peps.python.org/pep-{number:04d}/',
+                  status, expected_variants)
+        for number, (status, expected_variants) in enumerate(
+            [('Final', ('Final',)), ('Active', ('Active', 'Accepted')),
+             ('Draft', ('Final',)), ('Rejected', ())] * 10_000
+        )
+    ]
+    status_counter, inappropriate, total = utils.aggregate_pep_statuses(
+        pep_statuses)
+
+    assert status_counter == {
+        'Final': 10_000, 'Active': 10_000, 'Draft': 10_000, 'Rejected': 10_000
+    }
+    assert total == 40_000
+    assert len(inappropriate) == 10_000 and all(
+        item.real_status == 'Draft' and item.expected_variants == ('Final',)
+        for item in inappropriate
+    ), 'Несовпадения должны находиться сверкой с таблицей допустимых пар'
+    assert utils.aggregate_pep_statuses([]) == ({}, [], 0)
+
+
+def test_prefetch_is_ordered_and_bounded():
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+    produced = []
+
+    def produce():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    def work(item):
+        with lock:
+            in_flight.append(item)
+            peak.append(len(in_flight))
+        time.sleep(0.001 * (item % 3))
+        with lock:
+            in_flight.remove(item)
+        return item * 2
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = utils.prefetch(pool, work, produce(), depth=4)
+        first = next(results)
+        assert first == 0 and len(produced) <= 5, (
+            'Первый результат должен приходить до разбора всех строк'
+        )
+        assert [first, *results] == [item * 2 for item in range(100)], (
+            'Результаты должны выдаваться в порядке входных данных'
+        )
+    assert max(peak) <= 4, (
+        'Одновременно должно обрабатываться не больше depth элементов'
+    )
+
+
+@pytest.mark.parametrize('content', [
+    '{"entries": []}',
+    '[]',
+    '{"fetched_at": "yesterday", "entries": []}',
+    '{"fetched_at": 0, "entries": [["link", "3.12"]]}',
+    'not json',
+])
+def test_load_cached_versions_ignores_malformed_file(tmp_path, content):
+    path = tmp_path / 'latest_versions.json'
+    path.write_text(content, encoding='utf-8')
+    assert utils.load_cached_versions(path, ttl=float('inf')) is None, (
+        'Повреждённый файл кэша версий должен считаться промахом'
+    )
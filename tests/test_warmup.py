@@ -0,0 +1,77 @@
+import requests_mock
+from bs4 import BeautifulSoup
+from requests_cache import CachedSession
+
+try:
+    from src import constants, main, warmup
+    from src.records import WarmupStats
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `warmup.py`'
+
+NUMERICAL_PAGE = (
+    '<table><tr><th>Status</th><th>PEP</th></tr>'
+    + ''.join(
+        f'<tr><td>SF</td><td><a href="../pep-{number:04d}/">{number}</a>'
+        '</td><td>Title</td><td>Author</td></tr>'
+        for number in (1, 8, 20)
+    )
+    + '</table>'
+)
+
+
+def get_session():
+    session = CachedSession(backend='memory')
+    adapter = requests_mock.Adapter()
+    adapter.register_uri(
+        'GET', requests_mock.ANY,
+        text='<dl><dt>Status:</dt><dd>Final</dd></dl>'
+    )
+    adapter.register_uri(
+        'GET', constants.PEP_NUMERICAL_URL, text=NUMERICAL_PAGE)
+    session.mount('https://', adapter)
+    return session, adapter
+
+
+def test_warm_cache_counts_fresh_entries():
+    session, adapter = get_session()
+    modes = ('pep', 'latest-versions')
+
+    first = main.warm_cache(session, modes)
+    assert first[1:] == [
+        WarmupStats('pep', 4, 0, 4, 0),
+        WarmupStats('latest-versions', 1, 0, 1, 0),
+    ], 'При пустом кэше все страницы режимов должны загружаться'
+
+    calls = adapter.call_count
+    second = main.warm_cache(session, modes)
+    assert second[1:] == [
+        WarmupStats('pep', 4, 4, 0, 0),
+        WarmupStats('latest-versions', 1, 1, 0, 0),
+    ], 'Страницы, уже лежащие в кэше, должны учитываться как свежие'
+    assert adapter.call_count == calls
+
+
+def test_cache_bundle_export_and_import(tmp_path):
+    bundle = tmp_path / 'bundle.sqlite'
+    session, _ = get_session()
+    main.warm_cache(session, ('pep',), export_cache=bundle)
+    assert bundle.exists()
+
+    fresh_session, adapter = get_session()
+    results = main.warm_cache(fresh_session, ('pep',), import_cache=bundle)
+    assert results[1] == WarmupStats('pep', 4, 4, 0, 0), (
+        'После импорта выгрузки кэша страницы не должны загружаться заново'
+    )
+    assert adapter.call_count == 0
+
+
+def test_pep_page_urls_skip_malformed_rows():
+    soup = BeautifulSoup(
+        NUMERICAL_PAGE + '<tr><td>SF</td><td>9</td><td>x</td><td>y</td></tr>',
+        'lxml'
+    )
+    assert warmup.pep_page_urls(soup, constants.PEP_NUMERICAL_URL) == [
+        'https://peps.python.org/pep-0001/',
+        'https://peps.python.org/pep-0008/',
+        'https://peps.python.org/pep-0020/',
+    ]
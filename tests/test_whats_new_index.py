@@ -0,0 +1,180 @@
+import sqlite3
+
+import bs4
+import requests_mock
+from conftest import MAIN_DOC_URL
+
+try:
+    from src import configs, utils, whats_new_index
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `whats_new_index.py`'
+    )
+
+BASE_URL = MAIN_DOC_URL + 'whatsnew/'
+PAGES = {
+    '3.11': (
+        '<section id="whats-new-in-python-3-11"><h1>What’s New In Python '
+        '3.11¶</h1><p>Summary of the release.</p>'
+        '<section id="new-modules"><h2>New Modules¶</h2>'
+        '<p>The tomllib module adds support for parsing TOML.</p>'
+        '<p>Use asyncio.run() in f-strings, what\'s new.</p>'
+        '</section></section>'
+    ),
+    '3.10': (
+        '<section id="whats-new-in-python-3-10"><h1>What’s New In Python '
+        '3.10¶</h1><section id="pattern-matching"><h2>Pattern Matching¶</h2>'
+        '<p>Structural pattern matching has been added.</p>'
+        '</section></section>'
+    ),
+}
+
+
+def get_sections(versions=PAGES, extra=''):
+    return bs4.BeautifulSoup(
+        ''.join(
+            f'<li class="toctree-l1"><a href="{version}.html">{version}</a>'
+            '</li>'
+            for version in versions
+        ) + extra,
+        features='lxml'
+    ).find_all('li', class_='toctree-l1')
+
+
+def test_build_and_search_index(tmp_path, mock_session):
+    connection = whats_new_index.open_index(tmp_path / 'index.sqlite3')
+    with requests_mock.Mocker() as mock:
+        for version, text in PAGES.items():
+            mock.get(f'{BASE_URL}{version}.html', text=text)
+        got = whats_new_index.build_index(
+            mock_session, connection, get_sections(), BASE_URL)
+    assert got == (2, 0, 0), (
+        'При первом запуске индексируются все страницы'
+    )
+
+    found = whats_new_index.search_index(connection, 'tomllib')
+    assert [row[:3] for row in found] == [
+        ('3.11', 'New Modules', f'{BASE_URL}3.11.html#new-modules')
+    ], 'Поиск должен находить раздел, в котором упомянут модуль'
+
+
+def test_build_index_is_incremental(tmp_path, mock_session):
+    connection = whats_new_index.open_index(tmp_path / 'index.sqlite3')
+    with requests_mock.Mocker() as mock:
+        for version, text in PAGES.items():
+            mock.get(f'{BASE_URL}{version}.html', text=text)
+        whats_new_index.build_index(
+            mock_session, connection, get_sections(), BASE_URL)
+        mock_session.cache.clear()
+        mock.get(
+            f'{BASE_URL}3.10.html',
+            text=PAGES['3.10'].replace('Structural', 'Soft keyword')
+        )
+        mock.get(
+            f'{BASE_URL}3.11.html',
+            text=PAGES['3.11'] + '<footer>Built on 2026-10-19.</footer>'
+        )
+        got = whats_new_index.build_index(
+            mock_session, connection, get_sections(), BASE_URL)
+
+    assert got == (1, 1, 0), (
+        'Повторно индексируются только страницы с изменёнными разделами'
+    )
+    assert not whats_new_index.search_index(connection, 'Structural'), (
+        'Устаревшие записи изменённой страницы должны удаляться'
+    )
+    assert whats_new_index.search_index(connection, 'keyword'), (
+        'Новые записи изменённой страницы должны попадать в индекс'
+    )
+
+
+def test_search_index_accepts_dotted_names(tmp_path, mock_session):
+    connection = whats_new_index.open_index(tmp_path / 'index.sqlite3')
+    with requests_mock.Mocker() as mock:
+        for version, text in PAGES.items():
+            mock.get(f'{BASE_URL}{version}.html', text=text)
+        whats_new_index.build_index(
+            mock_session, connection, get_sections(), BASE_URL)
+
+    for query in ('asyncio.run', 'f-strings', "what's", 'tomllib "TOML'):
+        found = whats_new_index.search_index(connection, query)
+        assert 'New Modules' in [row[1] for row in found], (
+            f'Запрос {query!r} должен искаться как обычный текст'
+        )
+    assert whats_new_index.search_index(connection, '  ') == []
+
+
+def test_build_index_uses_parser_engine_setting(
+        tmp_path, mock_session, monkeypatch):
+    mock_session.parser_settings = configs.load_settings(
+        overrides=['parser_engine=html.parser'], environ={})
+    engines = []
+    get_soup = utils.get_soup
+
+    def recording_get_soup(response, parser):
+        engines.append(parser)
+        return get_soup(response, parser)
+
+    monkeypatch.setattr(utils, 'get_soup', recording_get_soup)
+    connection = whats_new_index.open_index(tmp_path / 'index.sqlite3')
+    with requests_mock.Mocker() as mock:
+        for version, text in PAGES.items():
+            mock.get(f'{BASE_URL}{version}.html', text=text)
+        whats_new_index.build_index(
+            mock_session, connection, get_sections(), BASE_URL)
+    assert engines == ['html.parser', 'html.parser'], (
+        'Индексация должна использовать парсер из настроек'
+    )
+
+
+def test_build_index_handles_toc_changes(tmp_path, mock_session):
+    pages = {
+        '3_1': PAGES['3.11'],
+        '3x1': PAGES['3.10'],
+    }
+    connection = whats_new_index.open_index(tmp_path / 'index.sqlite3')
+    with requests_mock.Mocker() as mock:
+        for version, text in pages.items():
+            mock.get(f'{BASE_URL}{version}.html', text=text)
+        whats_new_index.build_index(
+            mock_session, connection, get_sections(pages), BASE_URL)
+        mock_session.cache.clear()
+        mock.get(
+            f'{BASE_URL}3_1.html',
+            text=pages['3_1'].replace('tomllib', 'zoneinfo')
+        )
+        got = whats_new_index.build_index(
+            mock_session, connection, get_sections(pages), BASE_URL)
+        assert got == (1, 1, 0)
+        assert whats_new_index.search_index(connection, 'Structural'), (
+            'Переиндексация страницы не должна удалять записи страниц с '
+            'похожим адресом'
+        )
+
+        got = whats_new_index.build_index(
+            mock_session,
+            connection,
+            get_sections(
+                ['3_1'], '<li class="toctree-l1">Без ссылки</li>'),
+            BASE_URL
+        )
+    assert got == (0, 1, 1), (
+        'Повреждённый пункт оглавления пропускается, а страницы, которых '
+        'нет в оглавлении, удаляются из индекса'
+    )
+    assert not whats_new_index.search_index(connection, 'Structural')
+
+
+def test_open_index_recreates_outdated_schema(tmp_path):
+    path = tmp_path / 'index.sqlite3'
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        'CREATE TABLE pages (url TEXT PRIMARY KEY, version TEXT, '
+        'digest TEXT);'
+        'CREATE VIRTUAL TABLE entries USING fts5(version, heading, body, url);'
+    )
+    connection.close()
+    connection = whats_new_index.open_index(path)
+    columns = [row[1] for row in connection.execute(
+        'PRAGMA table_info(entries)')]
+    assert 'page_url' in columns, 'Индекс старой схемы должен пересоздаваться'